@@ -1,11 +1,30 @@
+import os
 import nltk
 
-# Download required NLTK data
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('universal_tagset')
-nltk.download('maxent_ne_chunker')
-nltk.download('words')
+# NLTK packages and the resource path used to check whether each is installed
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'universal_tagset': 'taggers/universal_tagset',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words',
+}
 
-print("NLTK data downloaded successfully!") 
\ No newline at end of file
+# Download into the first NLTK_DATA directory when set, otherwise NLTK's default
+download_dir = os.environ.get('NLTK_DATA', '').split(os.pathsep)[0] or None
+
+# Download required NLTK data that is not already installed
+missing = []
+for package, resource in NLTK_RESOURCES.items():
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        missing.append(package)
+
+if not missing:
+    print("NLTK data already present, nothing to download.")
+else:
+    for package in missing:
+        nltk.download(package, download_dir=download_dir, quiet=True)
+    print(f"NLTK data downloaded successfully: {', '.join(missing)}")
@@ -1,5 +1,7 @@
 import gradio as gr
 from pathlib import Path
+from collections import OrderedDict
+import hashlib
 import sys
 import os
 
@@ -12,6 +14,9 @@ from core.search import JobSearch
 from core.email import EmailGenerator
 from database.supabase_client import SupabaseClient
 
+# Number of parsed uploads remembered by content hash
+PARSE_CACHE_SIZE = 256
+
 class HireAIApp:
     def __init__(self):
         self.parser = ResumeParser()
@@ -19,6 +24,27 @@ class HireAIApp:
         self.search = JobSearch()
         self.email_gen = EmailGenerator()
         self.db = SupabaseClient()
+        self._parse_cache = OrderedDict()
+
+    def _parse_cached(self, file_path):
+        """Parse a resume, reusing the result for files with identical content"""
+        digest = hashlib.blake2b()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+        # Uploads with the same bytes but a different extension are read differently
+        key = (digest.hexdigest(), os.path.splitext(file_path)[1].lower())
+
+        parsed_data = self._parse_cache.get(key)
+        if parsed_data is None:
+            parsed_data = self.parser.parse(file_path)
+            self._parse_cache[key] = parsed_data
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        else:
+            self._parse_cache.move_to_end(key)
+        # Hand out a copy so the database client cannot alter the cached entry
+        return dict(parsed_data)
 
     def parse_resume(self, resume_file):
         """Parse resume and store in database"""
@@ -26,7 +52,7 @@ class HireAIApp:
             return "Please upload a resume file"
         
         try:
-            parsed_data = self.parser.parse(resume_file.name)
+            parsed_data = self._parse_cached(resume_file.name)
             self.db.store_candidate(parsed_data)
             return f"Successfully parsed resume for {parsed_data.get('name', 'Unknown')}"
         except Exception as e:
@@ -41,22 +67,24 @@ class HireAIApp:
         except Exception as e:
             return f"Error ranking candidates: {str(e)}"
 
-    def search_jobs(self, query):
+    def search_jobs(self, query, top_k=50):
         """Search jobs using natural language"""
         try:
-            results = self.search.search(query)
-            return "\n".join([f"{job['title']} at {job['company']}" for job in results])
+            results = self.search.search(query, top_k=top_k)
+            return "\n".join([f"{job['title']} at {job['company']}" for job, _ in results])
         except Exception as e:
             return f"Error searching jobs: {str(e)}"
 
     def generate_email(self, candidate_name, job_title):
-        """Generate outreach email"""
+        """Generate outreach email, streaming the text into the UI as it arrives"""
         try:
             candidate = self.db.get_candidate_by_name(candidate_name)
-            email = self.email_gen.generate(candidate, job_title)
-            return email
+            email = ""
+            for text in self.email_gen.generate_stream(candidate, job_title):
+                email += text
+                yield email
         except Exception as e:
-            return f"Error generating email: {str(e)}"
+            yield f"Error generating email: {str(e)}"
 
     def create_ui(self):
         """Create Gradio interface"""
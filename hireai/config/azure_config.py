@@ -1,10 +1,13 @@
 """
 Azure OpenAI Configuration
 """
+import os
 
 # Azure OpenAI Configuration
 AZURE_ENDPOINT = "https://openai-hackathonpoc-dev.openai.azure.com/"
 AZURE_MODEL_NAME = "gpt-35-turbo"
 AZURE_DEPLOYMENT = "hackathon-poc-turbo35"
+# Embeddings need their own deployment; the chat deployment above cannot serve them
+AZURE_EMBEDDING_DEPLOYMENT = os.getenv("AZURE_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
 AZURE_SUBSCRIPTION_KEY = "<AZURE_SUBSCRIPTION_KEY>"
 AZURE_API_VERSION = "2024-12-01-preview" 
@@ -1,34 +1,47 @@
-from typing import Dict, Any
-import openai
+from functools import lru_cache
+from typing import Dict, Any, Iterator
+from openai import OpenAI
 import os
 
+@lru_cache(maxsize=None)
+def _get_client() -> OpenAI:
+    """Shared OpenAI client so connections are reused across requests"""
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
 class EmailGenerator:
     def __init__(self):
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
+        if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("Missing OpenAI API key")
+        self.client = _get_client()
 
     def generate(self, candidate: Dict[str, Any], job_title: str) -> str:
         """Generate personalized outreach email"""
+        return ''.join(self.generate_stream(candidate, job_title)).strip()
+
+    def generate_stream(self, candidate: Dict[str, Any], job_title: str) -> Iterator[str]:
+        """Generate personalized outreach email, yielding text as the model produces it"""
         # Prepare prompt for OpenAI
         prompt = self._create_prompt(candidate, job_title)
         
         try:
             # Generate email using OpenAI
-            response = openai.ChatCompletion.create(
+            stream = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a professional recruiter writing a personalized outreach email."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=500,
+                stream=True
             )
             
-            return response.choices[0].message.content.strip()
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
             
         except Exception as e:
-            return f"Error generating email: {str(e)}"
+            yield f"Error generating email: {str(e)}"
 
     def _create_prompt(self, candidate: Dict[str, Any], job_title: str) -> str:
         """Create prompt for email generation"""
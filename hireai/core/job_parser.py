@@ -1,6 +1,9 @@
 import os
-from typing import Dict, Any
-from openai import AzureOpenAI
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import orjson
+from openai import AzureOpenAI, AsyncAzureOpenAI
 from ..config.azure_config import (
     AZURE_ENDPOINT,
     AZURE_MODEL_NAME,
@@ -9,6 +12,9 @@ from ..config.azure_config import (
     AZURE_API_VERSION
 )
 
+# Number of model responses kept in memory, keyed by normalized job request
+RESPONSE_CACHE_SIZE = int(os.getenv("HIREAI_JOB_CACHE_SIZE", "1024"))
+
 class JobRequestParser:
     def __init__(self):
         """Initialize the job request parser with Azure OpenAI client"""
@@ -17,7 +23,13 @@ class JobRequestParser:
             api_version=AZURE_API_VERSION,
             azure_endpoint=AZURE_ENDPOINT
         )
+        self.async_client = AsyncAzureOpenAI(
+            api_key=AZURE_SUBSCRIPTION_KEY,
+            api_version=AZURE_API_VERSION,
+            azure_endpoint=AZURE_ENDPOINT
+        )
         self.deployment = AZURE_DEPLOYMENT
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
 
     def parse_job_request(self, job_request: str) -> Dict[str, Any]:
         """
@@ -30,45 +42,109 @@ class JobRequestParser:
             Dict[str, Any]: Structured job information
         """
         try:
-            # Create the prompt for the model
-            prompt = f"""
-            Parse the following job request into a structured format. Extract the following information:
-            - job_title: The title of the position
-            - required_skills: List of required technical skills
-            - preferred_skills: List of preferred technical skills
-            - experience_years: Required years of experience
-            - location: Job location (if specified)
-            - job_type: Type of employment (full-time, contract, etc.)
-            - industry: Industry or domain (if specified)
+            cache_key = self._cache_key(job_request)
+            content = self._get_cached_response(cache_key)
+            if content is None:
+                # Call Azure OpenAI API
+                response = self.client.chat.completions.create(
+                    model=self.deployment,
+                    messages=self._build_messages(job_request),
+                    temperature=0.1,
+                    max_tokens=200,
+                    response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content
+                parsed = self._parse_response(content)
+                # Cached only once it parses, so a malformed completion is requested again
+                self._cache_response(cache_key, content)
+                return parsed
             
-            Job Request: {job_request}
+            # Extract and parse the response
+            return self._parse_response(content)
             
-            Return the information in a JSON format.
-            """
+        except Exception as e:
+            raise Exception(f"Error parsing job request: {str(e)}")
+
+    async def parse_job_request_async(self, job_request: str) -> Dict[str, Any]:
+        """
+        Parse a natural language job request without blocking the event loop
+        
+        Args:
+            job_request (str): Natural language job request
             
-            # Call Azure OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.deployment,
-                messages=[
-                    {"role": "system", "content": "You are a job request parser that extracts structured information from natural language job descriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
+        Returns:
+            Dict[str, Any]: Structured job information
+        """
+        try:
+            cache_key = self._cache_key(job_request)
+            content = self._get_cached_response(cache_key)
+            if content is None:
+                # Call Azure OpenAI API
+                response = await self.async_client.chat.completions.create(
+                    model=self.deployment,
+                    messages=self._build_messages(job_request),
+                    temperature=0.1,
+                    max_tokens=200,
+                    response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content
+                parsed = self._parse_response(content)
+                # Cached only once it parses, so a malformed completion is requested again
+                self._cache_response(cache_key, content)
+                return parsed
             
             # Extract and parse the response
-            parsed_response = response.choices[0].message.content
-            
-            # Convert the response to a dictionary
-            import json
-            job_info = json.loads(parsed_response)
-            
-            return job_info
+            return self._parse_response(content)
             
         except Exception as e:
             raise Exception(f"Error parsing job request: {str(e)}")
 
+    async def parse_job_requests(self, job_requests: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse several job requests concurrently
+        
+        Args:
+            job_requests (List[str]): Natural language job requests
+            
+        Returns:
+            List[Dict[str, Any]]: Structured job information in the same order as job_requests
+        """
+        return await asyncio.gather(*[self.parse_job_request_async(job_request) for job_request in job_requests])
+
+    @staticmethod
+    def _cache_key(job_request: str) -> str:
+        """Collapse whitespace so trivially different requests share a cache entry"""
+        return " ".join(job_request.split())
+
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Return a cached model response and mark it as recently used"""
+        content = self._response_cache.get(cache_key)
+        if content is not None:
+            self._response_cache.move_to_end(cache_key)
+        return content
+
+    def _cache_response(self, cache_key: str, content: str) -> None:
+        """Store a model response, evicting the least recently used one when full"""
+        self._response_cache[cache_key] = content
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    def _build_messages(self, job_request: str) -> List[Dict[str, str]]:
+        """Create the chat messages for a job request"""
+        return [
+            {"role": "system", "content": "Extract job request details as a JSON object with keys: "
+                                          "job_title (string), required_skills (list of strings), "
+                                          "preferred_skills (list of strings), experience_years (number), "
+                                          "location (string), job_type (string), industry (string). "
+                                          "Use an empty string or list when a value is not given."},
+            {"role": "user", "content": job_request}
+        ]
+
+    def _parse_response(self, parsed_response: str) -> Dict[str, Any]:
+        """Convert the model response to a dictionary"""
+        return orjson.loads(parsed_response)
+
     def normalize_job_info(self, job_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize the job information to ensure consistent format
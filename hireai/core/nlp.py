@@ -0,0 +1,55 @@
+"""
+Shared spaCy pipeline loader
+"""
+
+import os
+import logging
+from functools import lru_cache
+from typing import Tuple
+import spacy
+from spacy.attrs import LEMMA, IS_STOP
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "en_core_web_sm"
+
+# Lemmatization needs tagger + attribute_ruler for POS, but not NER or parsing
+LEMMA_EXCLUDE = ("ner", "parser")
+
+# Number of texts spaCy processes per batch
+SPACY_BATCH_SIZE = int(os.getenv("HIREAI_SPACY_BATCH", "64"))
+
+@lru_cache(maxsize=None)
+def get_nlp(exclude: Tuple[str, ...] = ()):
+    """
+    Load the spaCy model once per process for a given set of excluded components
+
+    Args:
+        exclude (Tuple[str, ...]): Pipeline components to leave out
+
+    Returns:
+        spacy.language.Language: Shared pipeline instance
+    """
+    try:
+        return spacy.load(SPACY_MODEL, exclude=list(exclude))
+    except OSError:
+        # If model not found, download it
+        logger.info("Downloading spaCy model...")
+        spacy.cli.download(SPACY_MODEL)
+        return spacy.load(SPACY_MODEL, exclude=list(exclude))
+
+def lemmatized_text(doc) -> str:
+    """
+    Join the lemmas of a document's non-stop-word tokens
+
+    Args:
+        doc (spacy.tokens.Doc): Processed document
+
+    Returns:
+        str: Space separated lemmas
+    """
+    # Pull lemma ids and stop flags out in one C-level pass instead of
+    # reading two attributes per token in Python
+    attrs = doc.to_array([LEMMA, IS_STOP])
+    strings = doc.vocab.strings
+    return ' '.join([strings[lemma] for lemma in attrs[attrs[:, 1] == 0, 0].tolist()])
@@ -1,22 +1,27 @@
 import os
-import nltk
-from pyresparser import ResumeParser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 import re
-import json
+import orjson
+from . import resume_parser
+
+# Threads reading resume files ahead of parsing in parse_many
+READER_THREADS = 8
+
+# Punctuation replaced by spaces when normalizing skills
+SKILL_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Common words that aren't skills
+NON_SKILLS = frozenset({'and', 'or', 'with', 'using', 'via', 'through'})
 
 class ResumeParser:
     def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        # Text extraction and field extractors; the spaCy model behind them is
+        # loaded once per process on first use
+        self.extractor = resume_parser.ResumeParser()
         
         # Initialize skill mappings
         self.skill_mappings = {
@@ -85,6 +90,15 @@ class ResumeParser:
             'gitlab': 'git',
         }
 
+        # Single-pass matcher over all mapped skills; longest variants first so
+        # "react.js" wins over shorter alternatives, and lookarounds keep "ts"
+        # from matching inside "tests"
+        self._skill_pattern = re.compile(
+            r'(?<!\w)(' +
+            '|'.join(re.escape(skill) for skill in sorted(self.skill_mappings, key=len, reverse=True)) +
+            r')(?!\w)'
+        )
+
     def normalize_skills(self, skills: List[str]) -> List[str]:
         """
         Normalize and clean a list of skills.
@@ -104,27 +118,21 @@ class ResumeParser:
             if not isinstance(skill, str):
                 continue
                 
-            # Convert to lowercase and remove special characters
-            skill = re.sub(r'[^\w\s]', ' ', skill.lower())
-            
-            # Split on common delimiters
-            skill_parts = re.split(r'[,/&+]', skill)
-            
-            for part in skill_parts:
-                # Clean and normalize each part
-                part = part.strip()
-                if not part or len(part) < 2:  # Skip empty or single-character skills
-                    continue
-                    
-                # Check for common variations
-                normalized = self.skill_mappings.get(part, part)
+            # Convert to lowercase and remove special characters. This also
+            # removes the ',/&+' delimiters, so each skill stays a single part.
+            part = SKILL_PUNCT_RE.sub(' ', skill.lower()).strip()
+            if not part or len(part) < 2:  # Skip empty or single-character skills
+                continue
                 
-                # Remove common words that aren't skills
-                if normalized not in {'and', 'or', 'with', 'using', 'via', 'through'}:
-                    normalized_skills.add(normalized)
+            # Check for common variations
+            normalized = self.skill_mappings.get(part, part)
+            
+            # Remove common words that aren't skills
+            if normalized not in NON_SKILLS:
+                normalized_skills.add(normalized)
         
         # Sort skills alphabetically
-        return sorted(list(normalized_skills))
+        return sorted(normalized_skills)
 
     def extract_skills_from_text(self, text: str) -> List[str]:
         """
@@ -139,66 +147,104 @@ class ResumeParser:
         if not text:
             return []
             
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Find all potential skills
-        found_skills = set()
+        # Find all mapped skills in one scan of the lowercased text
+        found_skills = {self.skill_mappings[match.group(1)]
+                        for match in self._skill_pattern.finditer(text.lower())}
         
-        # Check for each skill in the mappings
-        for skill, normalized in self.skill_mappings.items():
-            if skill in text:
-                found_skills.add(normalized)
-        
-        return sorted(list(found_skills))
+        return sorted(found_skills)
 
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, file_path: str, keep_raw: bool = False) -> Dict[str, Any]:
         """
-        Parse resume file and extract structured information using pyresparser
+        Parse resume file and extract structured information
         
         Args:
-            file_path (str): Path to the resume file (PDF or DOCX)
+            file_path (str): Path to the resume file (PDF, DOCX or TXT)
+            keep_raw (bool): Include the extractor output under 'raw_data'
             
         Returns:
             Dict[str, Any]: Structured resume data
         """
         try:
-            # Parse resume using pyresparser
-            data = ResumeParser(file_path).get_extracted_data()
-            
-            # Extract and normalize skills from different sources
-            skills_from_parser = data.get('skills', [])
-            skills_from_experience = []
-            
-            # Extract skills from experience descriptions
-            for exp in data.get('experience', []):
-                if isinstance(exp, str):
-                    skills_from_experience.extend(self.extract_skills_from_text(exp))
-            
-            # Combine and normalize all skills
-            all_skills = skills_from_parser + skills_from_experience
-            normalized_skills = self.normalize_skills(all_skills)
-            
-            # Convert to our standardized format
-            parsed_data = {
-                "name": data.get('name', ''),
-                "email": data.get('email', ''),
-                "phone": data.get('phone_number', ''),
-                "skills": normalized_skills,  # Use normalized skills
-                "education": self._process_education(data.get('degree', [])),
-                "experience": self._process_experience(data.get('experience', [])),
-                "location": data.get('location', ''),
-                "total_experience": data.get('total_experience', 0),
-                "company_names": data.get('company_names', []),
-                "designation": data.get('designation', []),
-                "raw_data": data  # Keep raw data for reference
-            }
-            
-            return parsed_data
-            
+            # Extract text and fields with our own pipeline
+            return self._standardize(self.extractor.parse_resume(file_path), keep_raw)
         except Exception as e:
             raise Exception(f"Error parsing resume: {str(e)}")
 
+    def parse_many(self, file_paths: List[str], max_workers: Optional[int] = None,
+                   keep_raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        Parse several resume files, reading files in background threads while
+        the extracted text is processed
+        
+        Args:
+            file_paths (List[str]): Paths to the resume files (PDF, DOCX or TXT)
+            max_workers (Optional[int]): Number of reader threads (defaults to READER_THREADS)
+            keep_raw (bool): Include the extractor output under 'raw_data'
+            
+        Returns:
+            List[Dict[str, Any]]: Structured resume data in the same order as file_paths
+        """
+        if not file_paths:
+            return []
+            
+        workers = max_workers or READER_THREADS
+        paths = iter(file_paths)
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of files read ahead so memory stays flat
+            pending = deque(executor.submit(self.extractor.read_file, path)
+                            for path in islice(paths, workers * 2))
+            while pending:
+                future = pending.popleft()
+                path = next(paths, None)
+                if path is not None:
+                    pending.append(executor.submit(self.extractor.read_file, path))
+                try:
+                    data = self.extractor.parse_text(future.result())
+                    results.append(self._standardize(data, keep_raw))
+                except Exception as e:
+                    for queued in pending:
+                        queued.cancel()
+                    raise Exception(f"Error parsing resume: {str(e)}")
+        return results
+
+    def _standardize(self, data: Dict[str, Any], keep_raw: bool) -> Dict[str, Any]:
+        """Convert extractor output to our standardized format"""
+        experience = data.get('experience', [])
+        
+        # Extract and normalize skills from different sources
+        skills_from_parser = data.get('skills', [])
+        skills_from_experience = []
+        
+        # Extract skills from experience entries
+        for exp in experience:
+            skills_from_experience.extend(self.extract_skills_from_text(
+                ' '.join([exp.get('title', ''), exp.get('company', ''), exp.get('description', '')])
+            ))
+        
+        # Combine and normalize all skills
+        all_skills = skills_from_parser + skills_from_experience
+        normalized_skills = self.normalize_skills(all_skills)
+        
+        # Convert to our standardized format
+        parsed_data = {
+            "name": data.get('name', ''),
+            "email": data.get('email', ''),
+            "phone": data.get('phone', ''),
+            "skills": normalized_skills,  # Use normalized skills
+            "education": data.get('education', []),
+            "experience": experience,
+            "location": data.get('location', ''),
+            "total_experience": data.get('total_experience', 0),
+            "company_names": [exp['company'] for exp in experience if exp.get('company')],
+            "designation": [exp['title'] for exp in experience if exp.get('title')]
+        }
+        
+        if keep_raw:
+            parsed_data["raw_data"] = data  # Keep raw data for reference
+        
+        return parsed_data
+
     def _process_skills(self, skills: List[str]) -> List[str]:
         """Process and clean skills list"""
         if not skills:
@@ -215,74 +261,21 @@ class ResumeParser:
         # Remove duplicates while preserving order
         return list(dict.fromkeys(cleaned_skills))
 
-    def _process_education(self, degrees: List[str]) -> List[Dict[str, Any]]:
-        """Process education information"""
-        education = []
-        for degree in degrees:
-            if isinstance(degree, str):
-                # Try to extract degree and field of study
-                degree_parts = degree.split(' in ')
-                if len(degree_parts) > 1:
-                    degree_name = degree_parts[0].strip()
-                    field = degree_parts[1].strip()
-                else:
-                    degree_name = degree.strip()
-                    field = "Unknown"
-                
-                education.append({
-                    "degree": degree_name,
-                    "field_of_study": field,
-                    "institution": "Unknown",  # pyresparser doesn't extract this
-                    "start_date": None,
-                    "end_date": None,
-                    "gpa": None
-                })
-        
-        return education
-
-    def _process_experience(self, experiences: List[str]) -> List[Dict[str, Any]]:
-        """Process work experience information"""
-        processed_experiences = []
-        
-        for exp in experiences:
-            if isinstance(exp, str):
-                # Try to extract company and title
-                company = "Unknown"
-                title = "Unknown"
-                
-                # Look for common patterns in experience text
-                if " at " in exp:
-                    parts = exp.split(" at ")
-                    title = parts[0].strip()
-                    company = parts[1].strip()
-                elif " with " in exp:
-                    parts = exp.split(" with ")
-                    title = parts[0].strip()
-                    company = parts[1].strip()
-                
-                processed_experiences.append({
-                    "company": company,
-                    "title": title,
-                    "description": exp,
-                    "start_date": None,
-                    "end_date": None,
-                    "skills": []  # Could be extracted from description if needed
-                })
-        
-        return processed_experiences
-
-    def save_to_json(self, parsed_data: Dict[str, Any], output_path: str) -> None:
-        """Save parsed resume data to JSON file"""
+    def save_to_json(self, parsed_data: Dict[str, Any], output_path: str, pretty: bool = True) -> None:
+        """Save parsed resume data to JSON file, compactly unless pretty is set"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(parsed_data, f, indent=2, ensure_ascii=False)
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(parsed_data, option=option))
         except Exception as e:
             raise Exception(f"Error saving parsed data: {str(e)}")
 
     def load_from_json(self, json_path: str) -> Dict[str, Any]:
         """Load parsed resume data from JSON file"""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(json_path, 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
-            raise Exception(f"Error loading parsed data: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Error loading parsed data: {str(e)}")
\ No newline at end of file
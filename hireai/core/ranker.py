@@ -1,47 +1,297 @@
-import spacy
-from typing import List, Dict, Any
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import pickle
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+import orjson
+from scipy.sparse import vstack
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.neighbors import NearestNeighbors
 import numpy as np
+from .nlp import get_nlp, lemmatized_text, LEMMA_EXCLUDE, SPACY_BATCH_SIZE
+
+# Number of prepared candidate texts memoized by content hash
+TEXT_CACHE_SIZE = int(os.getenv("HIREAI_TEXT_CACHE_SIZE", "10000"))
+
+# Candidate fields that contribute to the prepared text
+TEXT_FIELDS = ('skills', 'education', 'experience')
+
+# Largest dense float32 candidate matrix, in bytes, used for BLAS scoring
+DENSE_SCORING_BUDGET = int(os.getenv("HIREAI_DENSE_BUDGET", str(64 * 1024 * 1024)))
+
+# Keeps technical terms such as "node.js", "c++" and "c#" as single tokens
+TOKEN_PATTERN = r"(?u)\b[a-zA-Z][a-zA-Z0-9+#.\-]*[a-zA-Z0-9+#]"
+
+class CandidateIndex:
+    """Append-only store of candidates with their prepared text and TF-IDF rows"""
 
-class CandidateRanker:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.meta: List[Dict[str, Any]] = []
+        self.texts: List[str] = []
+        # Content hash of each candidate's text fields, None when it could not be hashed
+        self.keys: List[Optional[bytes]] = []
+        self.rows = []
+        self._matrix = None
+        self._dense = None
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def add(self, candidates: List[Dict[str, Any]], texts: List[str], rows,
+            keys: List[Optional[bytes]]) -> None:
+        """Append a batch of candidates together with their texts, sparse rows and content hashes"""
+        self.meta.extend(candidates)
+        self.texts.extend(texts)
+        self.keys.extend(keys)
+        self.rows.append(rows)
+        self._matrix = None
+        self._dense = None
+
+    @property
+    def matrix(self):
+        """All candidate rows stacked into one CSR matrix, rebuilt only after an add"""
+        if self._matrix is None and self.rows:
+            self._matrix = vstack(self.rows).tocsr()
+            # Keep the stacked matrix as the single block for future appends
+            self.rows = [self._matrix]
+        return self._matrix
+
+    def dense(self):
+        """
+        Dense float32 copy of the matrix restricted to its non-empty columns
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: Column ids and the dense rows, or None
+                when the dense matrix would exceed DENSE_SCORING_BUDGET
+        """
+        if self._dense is None:
+            matrix = self.matrix
+            columns = np.unique(matrix.indices)
+            if matrix.shape[0] * len(columns) * 4 > DENSE_SCORING_BUDGET:
+                self._dense = ()
+            else:
+                # Rows are already L2-normalized, so no rescaling is needed
+                dense_rows = np.ascontiguousarray(matrix[:, columns].toarray(), dtype=np.float32)
+                self._dense = (columns, dense_rows)
+        return self._dense or None
+
+    def matches(self, keys: List[Optional[bytes]]) -> bool:
+        """Whether the indexed candidates are the first len(self) of keys, by content"""
+        count = len(self.keys)
+        return bool(count) and None not in self.keys and keys[:count] == self.keys
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_dense'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Indexes saved before content hashes were kept are never reused by rank
+        state.setdefault('keys', [None] * len(state['meta']))
+        self.__dict__.update(state)
+
+
+class CandidateRanker:
+    def __init__(self, use_lemmas: bool = False):
+        """
+        Initialize the candidate ranker
+
+        Args:
+            use_lemmas (bool): Lemmatize candidate text with spaCy before vectorizing.
+                By default the vectorizer's regex tokenizer is used on its own.
+        """
+        self.use_lemmas = use_lemmas
+        # Stateless hashing keeps memory constant and lets new candidates be
+        # vectorized without rebuilding a vocabulary
+        self.hasher = HashingVectorizer(
+            n_features=2 ** 18,
+            alternate_sign=False,
+            norm=None,
+            stop_words='english',
+            token_pattern=TOKEN_PATTERN,
+            lowercase=True
+        )
+        # Rows come out L2-normalized so cosine similarity reduces to a dot product
+        self.transformer = TfidfTransformer(norm='l2', sublinear_tf=True)
+        self.candidate_index = CandidateIndex()
+        self._neighbors = None
+        self._text_cache: "OrderedDict[bytes, str]" = OrderedDict()
 
-    def rank(self, candidates: List[Dict[str, Any]], job_description: str) -> List[Dict[str, Any]]:
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp(LEMMA_EXCLUDE)
+
+    @property
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Indexed candidates in insertion order"""
+        return self.candidate_index.meta
+
+    @property
+    def candidate_matrix(self):
+        """Normalized TF-IDF rows of the indexed candidates"""
+        return self.candidate_index.matrix
+
+    def index(self, candidates: List[Dict[str, Any]], keys: Optional[List[Optional[bytes]]] = None) -> None:
+        """Fit the IDF weights on the candidate corpus and cache the normalized TF-IDF matrix"""
+        if keys is None:
+            keys = [self._content_key(candidate) for candidate in candidates]
+        texts = self._prepare_candidate_texts(candidates, keys)
+        rows = self.transformer.fit_transform(self.hasher.transform(texts)).tocsr()
+        self.candidate_index = CandidateIndex()
+        self.candidate_index.add(list(candidates), texts, rows, keys)
+        self._neighbors = None
+
+    def add(self, candidates: List[Dict[str, Any]], keys: Optional[List[Optional[bytes]]] = None) -> None:
+        """Append new candidates to the index using the already fitted IDF weights"""
+        if not self.candidate_index:
+            self.index(candidates, keys)
+            return
+        if not candidates:
+            return
+
+        if keys is None:
+            keys = [self._content_key(candidate) for candidate in candidates]
+        texts = self._prepare_candidate_texts(candidates, keys)
+        rows = self.transformer.transform(self.hasher.transform(texts)).tocsr()
+        self.candidate_index.add(list(candidates), texts, rows, keys)
+        self._neighbors = None
+
+    def rank(self, candidates: List[Dict[str, Any]], job_description: str,
+             top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """Rank candidates based on job description"""
-        # Prepare candidate texts
-        candidate_texts = []
-        for candidate in candidates:
-            text = self._prepare_candidate_text(candidate)
-            candidate_texts.append(text)
+        if not candidates:
+            return []
+
+        # Reuse the index when the pool's text content is unchanged or has only grown;
+        # comparing content hashes also catches candidates edited in place
+        keys = [self._content_key(candidate) for candidate in candidates]
+        indexed_count = len(self.candidate_index)
+        if self.candidate_index.matches(keys):
+            # Rows are reused, but results carry the caller's current candidates
+            self.candidate_index.meta[:indexed_count] = candidates[:indexed_count]
+            self.add(candidates[indexed_count:], keys[indexed_count:])
+        else:
+            self.index(candidates, keys)
+
+        job_vector = self.transformer.transform(self.hasher.transform([job_description]))
+
+        limit = top_k if top_k is not None and 0 < top_k < len(self.candidates) else None
+        dense = self.candidate_index.dense()
 
-        # Add job description to the corpus
-        all_texts = candidate_texts + [job_description]
+        if dense is not None:
+            # Hashed vocabularies are huge but sparse; a dense float32 matrix over the
+            # occupied columns turns scoring into a single BLAS matrix-vector product
+            columns, dense_rows = dense
+            query = job_vector[:, columns].toarray().ravel().astype(np.float32)
+            similarity_scores = dense_rows @ query
+            if limit is not None:
+                top = np.argpartition(-similarity_scores, limit - 1)[:limit]
+                order = top[np.argsort(-similarity_scores[top], kind='stable')]
+            else:
+                order = np.argsort(-similarity_scores, kind='stable')
+        elif limit is not None:
+            # Answer top-k queries from the nearest-neighbor index
+            distances, indices = self._get_neighbors().kneighbors(job_vector, n_neighbors=limit)
+            order = indices.ravel()
+            similarity_scores = np.zeros(len(self.candidates))
+            similarity_scores[order] = 1.0 - distances.ravel()
+        else:
+            # Calculate similarity scores as a single sparse matrix-vector product
+            similarity_scores = (self.candidate_matrix @ job_vector.T).toarray().ravel()
+            order = np.argsort(-similarity_scores, kind='stable')
 
-        # Create TF-IDF matrix
-        tfidf_matrix = self.vectorizer.fit_transform(all_texts)
+        # Only the returned candidates get a shallow copy carrying their score
+        return [{**self.candidates[i], 'score': float(similarity_scores[i])} for i in order]
 
-        # Calculate similarity scores
-        job_vector = tfidf_matrix[-1]
-        candidate_vectors = tfidf_matrix[:-1]
-        similarity_scores = cosine_similarity(candidate_vectors, job_vector).flatten()
+    def _get_neighbors(self) -> NearestNeighbors:
+        """Build the nearest-neighbor index over the candidate matrix on first use"""
+        if self._neighbors is None:
+            # Tree-based indexes do not accept sparse input, so use brute force cosine
+            self._neighbors = NearestNeighbors(metric='cosine', algorithm='brute')
+            self._neighbors.fit(self.candidate_matrix)
+        return self._neighbors
 
-        # Add scores to candidates
-        ranked_candidates = []
-        for candidate, score in zip(candidates, similarity_scores):
-            candidate_copy = candidate.copy()
-            candidate_copy['score'] = float(score)
-            ranked_candidates.append(candidate_copy)
+    def save_index(self, path: str) -> None:
+        """Save the fitted IDF weights and candidate index to disk"""
+        # Stack pending rows so the pickle holds a single matrix
+        self.candidate_index.matrix
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'transformer': self.transformer,
+                'candidate_index': self.candidate_index,
+                # Stored rows only match queries tokenized the same way
+                'use_lemmas': self.use_lemmas
+            }, f)
 
-        # Sort by score in descending order
-        ranked_candidates.sort(key=lambda x: x['score'], reverse=True)
+    def load_index(self, path: str) -> None:
+        """Load previously saved IDF weights and candidate index"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        self.transformer = state['transformer']
+        self.candidate_index = state['candidate_index']
+        self._neighbors = None
+        # Adopt the index's text preparation; memoized texts from the other mode are dropped
+        use_lemmas = state.get('use_lemmas', self.use_lemmas)
+        if use_lemmas != self.use_lemmas:
+            self.use_lemmas = use_lemmas
+            self.clear_text_cache()
 
-        return ranked_candidates
+    def _prepare_candidate_texts(self, candidates: List[Dict[str, Any]],
+                                 keys: Optional[List[Optional[bytes]]] = None) -> List[str]:
+        """Prepare candidate texts for comparison, reusing memoized results"""
+        if keys is None:
+            keys = [self._content_key(candidate) for candidate in candidates]
+        texts: List[Optional[str]] = []
+        missing = []
+        for i, key in enumerate(keys):
+            text = self._text_cache.get(key) if key is not None else None
+            if text is None:
+                missing.append(i)
+            else:
+                self._text_cache.move_to_end(key)
+            texts.append(text)
 
-    def _prepare_candidate_text(self, candidate: Dict[str, Any]) -> str:
-        """Prepare candidate text for comparison"""
+        if missing:
+            prepared = self._build_candidate_texts([candidates[i] for i in missing])
+            for i, text in zip(missing, prepared):
+                texts[i] = text
+                if keys[i] is not None:
+                    self._text_cache[keys[i]] = text
+            while len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+
+        return texts
+
+    def clear_text_cache(self) -> None:
+        """Drop memoized candidate texts"""
+        self._text_cache.clear()
+
+    @staticmethod
+    def _content_key(candidate: Dict[str, Any]) -> Optional[bytes]:
+        """Stable hash of the fields that make up a candidate's text, or None if unhashable"""
+        content = {field: candidate[field] for field in TEXT_FIELDS if field in candidate}
+        try:
+            payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _build_candidate_texts(self, candidates: List[Dict[str, Any]]) -> List[str]:
+        """Join and optionally lemmatize candidate fields"""
+        raw_texts = [self._join_parts(candidate) for candidate in candidates]
+        if not self.use_lemmas:
+            # The vectorizer tokenizes and drops stop words itself
+            return raw_texts
+
+        # Lemmatize all candidates in a single batched spaCy pass
+        docs = self.nlp.pipe(raw_texts, batch_size=SPACY_BATCH_SIZE)
+
+        # Remove stop words and lemmatize
+        return [lemmatized_text(doc) for doc in docs]
+
+    def _join_parts(self, candidate: Dict[str, Any]) -> str:
+        """Join the searchable fields of a candidate into one string"""
         text_parts = []
 
         # Add skills
@@ -70,11 +320,4 @@ class CandidateRanker:
                     if 'skills' in exp:
                         text_parts.extend(exp['skills'])
 
-        # Join all parts and clean
-        text = ' '.join(text_parts)
-        doc = self.nlp(text)
-        
-        # Remove stop words and lemmatize
-        cleaned_text = ' '.join([token.lemma_ for token in doc if not token.is_stop])
-        
-        return cleaned_text 
\ No newline at end of file
+        return ' '.join(text_parts)
\ No newline at end of file
@@ -1,25 +1,97 @@
 import os
-import spacy
-from typing import List, Dict, Any
+import mmap
+import logging
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
 import re
 from pathlib import Path
 import shutil
 import docx2txt
+import pypdfium2 as pdfium
 from pdfminer.high_level import extract_text
 from datetime import datetime
+import numpy as np
+from .nlp import get_nlp
+
+logger = logging.getLogger(__name__)
+
+# Name extraction only needs the NER component
+NER_EXCLUDE = ("tagger", "parser", "attribute_ruler", "lemmatizer")
+
+# Slice of the resume tagged when looking for the candidate's name
+NAME_HEAD_LINES = 10
+NAME_HEAD_CHARS = 1000
+NAME_FALLBACK_CHARS = 5000
+
+# Common technical skills to look for
+COMMON_SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "angular", "vue",
+    "node.js", "express", "django", "flask", "spring", "aws", "azure", "gcp",
+    "docker", "kubernetes", "jenkins", "git", "sql", "nosql", "mongodb",
+    "postgresql", "mysql", "redis", "html", "css", "sass", "less", "bootstrap",
+    "tailwind", "material-ui", "redux", "graphql", "rest", "api", "microservices",
+    "ci/cd", "devops", "agile", "scrum", "jira", "confluence", "linux", "unix"
+]
+
+# Email patterns, tried in order
+EMAIL_RES = [re.compile(pattern) for pattern in (
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Standard email
+    r'\b[A-Za-z0-9._%+-]+\[at\][A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # [at] format
+    r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'  # Email with spaces
+)]
+
+# Phone patterns, tried in order
+PHONE_RES = [re.compile(pattern) for pattern in (
+    r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Standard format
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Simple format
+    r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',  # (XXX) XXX-XXXX format
+    r'\b\+\d{1,3}\s*\d{3}\s*\d{3}\s*\d{4}\b'  # International format
+)]
+PHONE_STRIP_RE = re.compile(r'[^\d+]')
+
+# Year range such as "2019 - 2021" or "2019 - present". Any other word after the dash
+# still starts a range ending today, but is left for the other detectors to match
+DATE_RANGE_PATTERN = (
+    r'(?P<dates>(?P<start_year>\d{4})\s*-\s*'
+    r'(?:(?P<end_year>\d{4}|present|current|now)|(?=\w)))'
+)
+
+# Single-pass education line scanner; each named group is one detector
+EDU_LINE_RE = re.compile(
+    DATE_RANGE_PATTERN +
+    r'|(?P<gpa>(?:gpa|grade point average)[:\s]+(?P<gpa_value>\d+\.?\d*))'
+    r'|(?P<degree>bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?)'
+    r'|(?P<institution>university|college|institute)'
+    r'|(?P<field>computer science|engineering|information technology|it)',
+    re.IGNORECASE
+)
+
+# Single-pass experience line scanner; each named group is one detector
+EXP_LINE_RE = re.compile(
+    DATE_RANGE_PATTERN +
+    r'|(?P<title>developer|engineer|architect|consultant|manager)'
+    r'|(?P<company>inc\.?|ltd\.?|llc|corp\.?|company)'
+    r'|(?P<current>present|current|now)'
+    r'|(?P<section>experience|work|employment)'
+    r'|(?P<duration>years?|months?)',
+    re.IGNORECASE
+)
+EXP_CURRENT_RE = re.compile(r'(present|current|now)', re.IGNORECASE)
+
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Single alternation over all skills so the text is scanned once
+SKILL_RE = re.compile(
+    r"\b(" + "|".join(re.escape(skill) for skill in sorted(COMMON_SKILLS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
 
 class ResumeParser:
     def __init__(self):
         """Initialize the resume parser"""
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            # If model not found, download it
-            print("Downloading spaCy model...")
-            spacy.cli.download("en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
-            
+        # spaCy is loaded lazily on first use and shared across parser instances
+
         # Create config directory if it doesn't exist
         self.config_dir = Path(os.path.dirname(os.path.abspath(__file__))) / "config"
         self.config_dir.mkdir(exist_ok=True)
@@ -52,7 +124,7 @@ include_raw_text = false
         with open(self.config_file, "w") as f:
             f.write(config_content)
 
-    def _read_file(self, file_path: str) -> str:
+    def read_file(self, file_path: str) -> str:
         """
         Read text from different file formats
         
@@ -62,26 +134,25 @@ include_raw_text = false
         Returns:
             str: Extracted text
         """
-        print(f"Reading file: {file_path}")
+        logger.debug("Reading file: %s", file_path)
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
             
         file_extension = os.path.splitext(file_path)[1].lower()
-        print(f"File extension: {file_extension}")
+        logger.debug("File extension: %s", file_extension)
         
         try:
             text = None
             if file_extension == '.pdf':
-                print("Processing PDF file...")
-                text = extract_text(file_path)
+                logger.debug("Processing PDF file...")
+                text = self._read_pdf_file(file_path)
             elif file_extension == '.docx':
-                print("Processing DOCX file...")
+                logger.debug("Processing DOCX file...")
                 text = docx2txt.process(file_path)
             elif file_extension == '.txt':
-                print("Processing TXT file...")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
+                logger.debug("Processing TXT file...")
+                text = self._read_text_file(file_path)
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
                 
@@ -92,55 +163,99 @@ include_raw_text = false
                 raise ValueError(f"Invalid text type: {type(text)}")
                 
             text = text.strip()
-            print(f"Successfully extracted text, length: {len(text)}")
+            logger.debug("Successfully extracted text, length: %d", len(text))
             return text
             
         except Exception as e:
             import traceback
             error_msg = f"Error reading file: {str(e)}\nTraceback: {traceback.format_exc()}"
-            print(error_msg)
+            logger.error(error_msg)
             raise Exception(error_msg)
 
+    @staticmethod
+    def _read_pdf_file(file_path: str) -> str:
+        """Extract PDF text with PDFium, falling back to pdfminer when nothing is found"""
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+
+        # PDFium ends lines with CRLF; the line-based extractors expect LF
+        text = "\n".join(pages).replace('\r\n', '\n')
+        if text.strip():
+            return text
+
+        logger.debug("PDFium returned no text, falling back to pdfminer")
+        return extract_text(file_path)
+
+    @staticmethod
+    def _read_text_file(file_path: str) -> str:
+        """Decode a plain text file straight from a memory map"""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = mm[:].decode('utf-8')
+        # Match the newline translation of text-mode reads
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
     def parse_resume(self, file_path: str) -> Dict[str, Any]:
         """Parse a resume file and extract relevant information"""
+        logger.debug("Starting to parse resume: %s", file_path)
+        
         try:
-            print(f"Starting to parse resume: {file_path}")
-            
             # Read the file content
-            content = self._read_file(file_path)
-            print(f"File content length: {len(content) if content else 0}")
+            content = self.read_file(file_path)
+        except Exception as e:
+            import traceback
+            error_msg = f"Error parsing resume: {str(e)}\nTraceback: {traceback.format_exc()}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        return self.parse_text(content)
+
+    def parse_text(self, content: str) -> Dict[str, Any]:
+        """Extract relevant information from already extracted resume text"""
+        try:
+            logger.debug("File content length: %d", len(content) if content else 0)
             
             if not content or not isinstance(content, str):
                 raise ValueError("Invalid or empty file content")
             
             # Extract basic information
-            print("Extracting name...")
+            logger.debug("Extracting name...")
             name = self._extract_name(content) or "Unknown"
-            print(f"Extracted name: {name}")
+            logger.debug("Extracted name: %s", name)
             
-            print("Extracting email...")
+            logger.debug("Extracting email...")
             email = self._extract_email(content) or "Not provided"
-            print(f"Extracted email: {email}")
+            logger.debug("Extracted email: %s", email)
             
-            print("Extracting phone...")
+            logger.debug("Extracting phone...")
             phone = self._extract_phone(content) or "Not provided"
-            print(f"Extracted phone: {phone}")
+            logger.debug("Extracted phone: %s", phone)
             
-            print("Extracting skills...")
+            logger.debug("Extracting skills...")
             skills = self._extract_skills(content) or []
-            print(f"Extracted skills: {skills}")
+            logger.debug("Extracted skills: %s", skills)
             
-            print("Extracting education...")
+            logger.debug("Extracting education...")
             education = self._extract_education(content) or []
-            print(f"Extracted education: {education}")
+            logger.debug("Extracted education: %s", education)
             
-            print("Extracting experience...")
+            logger.debug("Extracting experience...")
             experience = self._extract_experience(content) or []
-            print(f"Extracted experience: {experience}")
+            logger.debug("Extracted experience: %s", experience)
             
-            print("Calculating total experience...")
+            logger.debug("Calculating total experience...")
             total_experience = self._calculate_total_experience(experience)
-            print(f"Total experience: {total_experience}")
+            logger.debug("Total experience: %s", total_experience)
             
             # Validate the extracted data
             if not name and not email and not phone and not skills and not education and not experience:
@@ -155,29 +270,45 @@ include_raw_text = false
                 "experience": experience,
                 "total_experience": total_experience
             }
-            print("Successfully parsed resume")
+            logger.debug("Successfully parsed resume")
             return result
             
         except Exception as e:
             import traceback
             error_msg = f"Error parsing resume: {str(e)}\nTraceback: {traceback.format_exc()}"
-            print(error_msg)
+            logger.error(error_msg)
             raise Exception(error_msg)
 
+    def parse_many(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parse several resume files in parallel worker processes
+        
+        Args:
+            file_paths (List[str]): Paths to the resume files
+            max_workers (Optional[int]): Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            List[Dict[str, Any]]: Parsed resumes in the same order as file_paths
+        """
+        if not file_paths:
+            return []
+            
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(self.parse_resume, file_paths, chunksize=4))
+
     def _extract_name(self, text: str) -> str:
         """Extract name from resume text using NLP"""
         if not text:
             return "Unknown"
             
-        doc = self.nlp(text)
-        
-        # Look for person names in the first few sentences
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                return ent.text
+        # Names sit at the top of a resume, so only tag the first lines
+        head = '\n'.join(text.split('\n', NAME_HEAD_LINES)[:NAME_HEAD_LINES])[:NAME_HEAD_CHARS]
+        name = self._find_person(head)
+        if name:
+            return name
         
         # Fallback: Look for capitalized words at the start of the document
-        lines = text.split('\n')
+        lines = text.split('\n', 5)
         for line in lines[:5]:  # Check first 5 lines
             words = line.strip().split()
             if len(words) >= 2:  # At least first and last name
@@ -185,22 +316,29 @@ include_raw_text = false
                 if all(word[0].isupper() for word in words[:2]):
                     return ' '.join(words[:2])
         
+        # Last resort: tag a larger slice of the document
+        if len(text) > len(head):
+            name = self._find_person(text[:NAME_FALLBACK_CHARS])
+            if name:
+                return name
+        
         return "Unknown"
 
+    @staticmethod
+    def _find_person(text: str) -> Optional[str]:
+        """Return the first PERSON entity in the text, if any"""
+        for ent in get_nlp(NER_EXCLUDE)(text).ents:
+            if ent.label_ == "PERSON":
+                return ent.text
+        return None
+
     def _extract_email(self, text: str) -> str:
         """Extract email from resume text"""
         if not text:
             return "Not provided"
             
-        # Enhanced email pattern to catch more variations
-        email_patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Standard email
-            r'\b[A-Za-z0-9._%+-]+\[at\][A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # [at] format
-            r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'  # Email with spaces
-        ]
-        
-        for pattern in email_patterns:
-            match = re.search(pattern, text)
+        for pattern in EMAIL_RES:
+            match = pattern.search(text)
             if match:
                 email = match.group(0)
                 # Clean up the email
@@ -214,20 +352,12 @@ include_raw_text = false
         if not text:
             return "Not provided"
             
-        # Enhanced phone patterns to catch more variations
-        phone_patterns = [
-            r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Standard format
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Simple format
-            r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',  # (XXX) XXX-XXXX format
-            r'\b\+\d{1,3}\s*\d{3}\s*\d{3}\s*\d{4}\b'  # International format
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
+        for pattern in PHONE_RES:
+            match = pattern.search(text)
             if match:
                 phone = match.group(0)
                 # Clean up the phone number
-                phone = re.sub(r'[^\d+]', '', phone)  # Keep only digits and +
+                phone = PHONE_STRIP_RE.sub('', phone)  # Keep only digits and +
                 return phone
         
         return "Not provided"
@@ -235,42 +365,20 @@ include_raw_text = false
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
         if not text:
-            print("Empty text provided for skill extraction")
+            logger.debug("Empty text provided for skill extraction")
             return []
             
-        print("Starting skill extraction...")
-        # Common technical skills to look for
-        common_skills = [
-            "python", "java", "javascript", "typescript", "react", "angular", "vue",
-            "node.js", "express", "django", "flask", "spring", "aws", "azure", "gcp",
-            "docker", "kubernetes", "jenkins", "git", "sql", "nosql", "mongodb",
-            "postgresql", "mysql", "redis", "html", "css", "sass", "less", "bootstrap",
-            "tailwind", "material-ui", "redux", "graphql", "rest", "api", "microservices",
-            "ci/cd", "devops", "agile", "scrum", "jira", "confluence", "linux", "unix"
-        ]
+        logger.debug("Starting skill extraction...")
+        # Find all skills in a single pass over the text
+        found_skills = sorted(set(match.group(1).lower() for match in SKILL_RE.finditer(text)))
         
-        # Convert text to lowercase for case-insensitive matching
-        text_lower = text.lower()
-        
-        # Find skills in text
-        found_skills = []
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        print(f"Found {len(found_skills)} skills: {found_skills}")
+        logger.debug("Found %d skills: %s", len(found_skills), found_skills)
         return found_skills
 
     def _extract_education(self, text: str) -> List[Dict[str, Any]]:
         """Extract education information from resume text"""
         education = []
-        
-        # Look for common education patterns
-        education_patterns = [
-            r'(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?)',
-            r'(?i)(university|college|institute)',
-            r'(?i)(computer science|engineering|information technology|it)'
-        ]
+        today = datetime.now().strftime("%Y-%m-%d")
         
         # Split text into lines and look for education information
         lines = text.split('\n')
@@ -280,16 +388,21 @@ include_raw_text = false
             line = line.strip()
             if not line:
                 continue
+            
+            # Scan the line once, collecting the first hit of each detector
+            found = {}
+            for match in EDU_LINE_RE.finditer(line):
+                found.setdefault(match.lastgroup, match)
                 
             # Check if line contains education-related information
-            if any(re.search(pattern, line) for pattern in education_patterns):
+            if 'degree' in found or 'institution' in found or 'field' in found:
                 if current_edu:
                     # Only require essential fields
                     if current_edu["degree"] and current_edu["institution"]:
                         # Ensure all required fields have proper values
                         current_edu["field_of_study"] = current_edu["field_of_study"] or "Not specified"
-                        current_edu["start_date"] = current_edu["start_date"] or datetime.now().strftime("%Y-%m-%d")
-                        current_edu["end_date"] = current_edu["end_date"] or datetime.now().strftime("%Y-%m-%d")
+                        current_edu["start_date"] = current_edu["start_date"] or today
+                        current_edu["end_date"] = current_edu["end_date"] or today
                         current_edu["gpa"] = float(current_edu["gpa"]) if current_edu["gpa"] else 0.0
                         education.append(current_edu)
                 
@@ -297,31 +410,27 @@ include_raw_text = false
                     "degree": "",
                     "field_of_study": "Not specified",
                     "institution": "",
-                    "start_date": datetime.now().strftime("%Y-%m-%d"),
-                    "end_date": datetime.now().strftime("%Y-%m-%d"),
+                    "start_date": today,
+                    "end_date": today,
                     "gpa": 0.0
                 }
                 
                 # Extract degree
-                degree_match = re.search(r'(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?)', line)
-                if degree_match:
-                    current_edu["degree"] = degree_match.group(0)
+                if 'degree' in found:
+                    current_edu["degree"] = found['degree'].group('degree')
                 
                 # Extract field of study
-                field_match = re.search(r'(?i)(computer science|engineering|information technology|it)', line)
-                if field_match:
-                    current_edu["field_of_study"] = field_match.group(0)
+                if 'field' in found:
+                    current_edu["field_of_study"] = found['field'].group('field')
                 
                 # Extract institution
-                inst_match = re.search(r'(?i)(university|college|institute)', line)
-                if inst_match:
+                if 'institution' in found:
                     current_edu["institution"] = line
                 
                 # Extract dates if present
-                date_match = re.search(r'(\d{4})\s*-\s*(\d{4}|\w+)', line)
-                if date_match:
-                    start_year = date_match.group(1)
-                    end_year = date_match.group(2)
+                if 'dates' in found:
+                    start_year = found['dates'].group('start_year')
+                    end_year = found['dates'].group('end_year') or ''
                     
                     # Set start date
                     current_edu["start_date"] = f"{start_year}-01-01"
@@ -330,13 +439,12 @@ include_raw_text = false
                     if end_year.isdigit():
                         current_edu["end_date"] = f"{end_year}-12-31"
                     else:
-                        current_edu["end_date"] = datetime.now().strftime("%Y-%m-%d")
+                        current_edu["end_date"] = today
                 
                 # Extract GPA if present
-                gpa_match = re.search(r'(?i)(gpa|grade point average)[:\s]+(\d+\.?\d*)', line)
-                if gpa_match:
+                if 'gpa' in found:
                     try:
-                        current_edu["gpa"] = float(gpa_match.group(2))
+                        current_edu["gpa"] = float(found['gpa'].group('gpa_value'))
                     except ValueError:
                         current_edu["gpa"] = 0.0
         
@@ -344,8 +452,8 @@ include_raw_text = false
         if current_edu and current_edu["degree"] and current_edu["institution"]:
             # Ensure all required fields have proper values
             current_edu["field_of_study"] = current_edu["field_of_study"] or "Not specified"
-            current_edu["start_date"] = current_edu["start_date"] or datetime.now().strftime("%Y-%m-%d")
-            current_edu["end_date"] = current_edu["end_date"] or datetime.now().strftime("%Y-%m-%d")
+            current_edu["start_date"] = current_edu["start_date"] or today
+            current_edu["end_date"] = current_edu["end_date"] or today
             current_edu["gpa"] = float(current_edu["gpa"]) if current_edu["gpa"] else 0.0
             education.append(current_edu)
         
@@ -354,26 +462,27 @@ include_raw_text = false
     def _extract_experience(self, text: str) -> List[Dict[str, Any]]:
         """Extract work experience from resume text"""
         if not text:
-            print("Empty text provided for experience extraction")
+            logger.debug("Empty text provided for experience extraction")
             return []
             
-        print("Starting experience extraction...")
+        logger.debug("Starting experience extraction...")
         experience = []
-        
-        # Look for common experience patterns
-        experience_patterns = [
-            r'(?i)(experience|work|employment)',
-            r'(?i)(years?|months?)',
-            r'(?i)(developer|engineer|architect|consultant|manager)',
-            r'(?i)(present|current|now)'
-        ]
+        today = datetime.now().strftime("%Y-%m-%d")
         
         try:
+            # Find skills once over the whole resume, then look them up by line span
+            skill_matches = [(match.start(), match.group(1).lower()) for match in SKILL_RE.finditer(text)]
+            skill_starts = [start for start, _ in skill_matches]
+            
             # Split text into lines and look for experience information
             lines = text.split('\n')
             current_exp = None
+            line_end = -1
             
             for line in lines:
+                line_start = line_end + 1
+                line_end = line_start + len(line)
+                
                 if not line or not isinstance(line, str):
                     continue
                     
@@ -381,16 +490,28 @@ include_raw_text = false
                 if not line:
                     continue
                     
-                # Check if line contains experience-related information
+                # Scan the line once and dispatch on the detector that matched
                 has_experience_info = False
-                for pattern in experience_patterns:
-                    try:
-                        if re.search(pattern, line):
-                            has_experience_info = True
-                            break
-                    except Exception as e:
-                        print(f"Error checking pattern {pattern}: {str(e)}")
-                        continue
+                title = ""
+                has_company = False
+                is_current = False
+                date_ranges = []
+                for match in EXP_LINE_RE.finditer(line):
+                    kind = match.lastgroup
+                    if kind == 'dates':
+                        end_year = match.group('end_year') or ''
+                        date_ranges.append((match.group('start_year'), end_year))
+                        if EXP_CURRENT_RE.search(end_year):
+                            is_current = has_experience_info = True
+                    elif kind == 'title':
+                        title = title or match.group('title')
+                        has_experience_info = True
+                    elif kind == 'company':
+                        has_company = True
+                    elif kind == 'current':
+                        is_current = has_experience_info = True
+                    else:
+                        has_experience_info = True
                 
                 if has_experience_info:
                     if current_exp:
@@ -399,107 +520,99 @@ include_raw_text = false
                             # Ensure all required fields have proper values
                             current_exp["description"] = current_exp["description"] or "No description provided"
                             current_exp["skills"] = current_exp["skills"] or []
-                            current_exp["start_date"] = current_exp["start_date"] or datetime.now().strftime("%Y-%m-%d")
-                            current_exp["end_date"] = current_exp["end_date"] or datetime.now().strftime("%Y-%m-%d")
+                            current_exp["start_date"] = current_exp["start_date"] or today
+                            current_exp["end_date"] = current_exp["end_date"] or today
                             experience.append(current_exp)
                     
                     current_exp = {
                         "title": "",
                         "company": "",
-                        "start_date": datetime.now().strftime("%Y-%m-%d"),
-                        "end_date": datetime.now().strftime("%Y-%m-%d"),
+                        "start_date": today,
+                        "end_date": today,
                         "description": "No description provided",
                         "skills": []
                     }
                     
                     # Extract job title
-                    try:
-                        title_match = re.search(r'(?i)(developer|engineer|architect|consultant|manager)', line)
-                        if title_match:
-                            current_exp["title"] = title_match.group(0)
-                    except Exception as e:
-                        print(f"Error extracting title: {str(e)}")
+                    if title:
+                        current_exp["title"] = title
                     
                     # Extract company name
-                    try:
-                        company_match = re.search(r'(?i)(inc\.?|ltd\.?|llc|corp\.?|company)', line)
-                        if company_match:
-                            current_exp["company"] = line
-                    except Exception as e:
-                        print(f"Error extracting company: {str(e)}")
-                    
-                    # Check if this is current experience
-                    is_current = False
-                    try:
-                        is_current = bool(re.search(r'(?i)(present|current|now)', line))
-                    except Exception as e:
-                        print(f"Error checking current status: {str(e)}")
+                    if has_company:
+                        current_exp["company"] = line
                     
                     # Extract dates if present and not current experience
                     if not is_current:
-                        try:
-                            date_match = re.search(r'(\d{4})\s*-\s*(\d{4}|\w+)', line)
-                            if date_match:
-                                start_year = date_match.group(1)
-                                end_year = date_match.group(2)
-                                
-                                # Set start date
-                                current_exp["start_date"] = f"{start_year}-01-01"
-                                
-                                # Set end date
-                                if end_year.isdigit():
-                                    current_exp["end_date"] = f"{end_year}-12-31"
-                                else:
-                                    current_exp["end_date"] = datetime.now().strftime("%Y-%m-%d")
-                        except Exception as e:
-                            print(f"Error extracting dates: {str(e)}")
+                        if date_ranges:
+                            start_year, end_year = date_ranges[0]
+                            
+                            # Set start date
+                            current_exp["start_date"] = f"{start_year}-01-01"
+                            
+                            # Set end date
+                            if end_year.isdigit():
+                                current_exp["end_date"] = f"{end_year}-12-31"
+                            else:
+                                current_exp["end_date"] = today
                     else:
                         # For current experience, only set start date
-                        try:
-                            date_match = re.search(r'(\d{4})\s*-\s*(present|current|now)', line, re.IGNORECASE)
-                            if date_match:
-                                start_year = date_match.group(1)
+                        for start_year, end_year in date_ranges:
+                            if EXP_CURRENT_RE.match(end_year):
                                 current_exp["start_date"] = f"{start_year}-01-01"
-                                current_exp["end_date"] = datetime.now().strftime("%Y-%m-%d")
-                        except Exception as e:
-                            print(f"Error extracting current experience dates: {str(e)}")
+                                current_exp["end_date"] = today
+                                break
                     
                     # Extract skills mentioned in the experience
                     try:
-                        skills = self._extract_skills(line)
+                        first = bisect_left(skill_starts, line_start)
+                        last = bisect_left(skill_starts, line_end)
+                        skills = sorted(set(skill for _, skill in skill_matches[first:last]))
                         if skills:
                             current_exp["skills"] = skills
                     except Exception as e:
-                        print(f"Error extracting skills: {str(e)}")
+                        logger.debug("Error extracting skills: %s", e)
             
             # Add the last experience entry if exists and has essential fields
             if current_exp and current_exp["title"] and current_exp["company"]:
                 # Ensure all required fields have proper values
                 current_exp["description"] = current_exp["description"] or "No description provided"
                 current_exp["skills"] = current_exp["skills"] or []
-                current_exp["start_date"] = current_exp["start_date"] or datetime.now().strftime("%Y-%m-%d")
-                current_exp["end_date"] = current_exp["end_date"] or datetime.now().strftime("%Y-%m-%d")
+                current_exp["start_date"] = current_exp["start_date"] or today
+                current_exp["end_date"] = current_exp["end_date"] or today
                 experience.append(current_exp)
             
-            print(f"Found {len(experience)} experience entries")
+            logger.debug("Found %d experience entries", len(experience))
             return experience
             
         except Exception as e:
-            print(f"Error in experience extraction: {str(e)}")
+            logger.warning("Error in experience extraction: %s", e)
             return []
 
     def _calculate_total_experience(self, experience: List[Dict[str, Any]]) -> float:
         """Calculate total years of experience"""
-        total_years = 0.0
+        # Keep entries whose dates are ISO formatted so they can be converted in one go
+        date_ranges = [
+            (exp["start_date"], exp["end_date"])
+            for exp in experience
+            if isinstance(exp.get("start_date"), str) and ISO_DATE_RE.fullmatch(exp["start_date"])
+            and isinstance(exp.get("end_date"), str) and ISO_DATE_RE.fullmatch(exp["end_date"])
+        ]
+        if not date_ranges:
+            return 0.0
         
-        for exp in experience:
-            if exp.get("start_date") and exp.get("end_date"):
+        try:
+            dates = np.array(date_ranges, dtype="datetime64[D]")
+        except ValueError:
+            # Drop out-of-range dates such as month 13 and convert the rest
+            valid_ranges = []
+            for start, end in date_ranges:
                 try:
-                    start = datetime.strptime(exp["start_date"], "%Y-%m-%d")
-                    end = datetime.strptime(exp["end_date"], "%Y-%m-%d")
-                    years = (end - start).days / 365.25
-                    total_years += years
-                except (ValueError, TypeError):
+                    valid_ranges.append((np.datetime64(start, "D"), np.datetime64(end, "D")))
+                except ValueError:
                     continue
+            if not valid_ranges:
+                return 0.0
+            dates = np.array(valid_ranges, dtype="datetime64[D]")
         
-        return round(total_years, 1) 
\ No newline at end of file
+        total_days = (dates[:, 1] - dates[:, 0]).astype(np.float64).sum()
+        return round(float(total_days) / 365.25, 1)
\ No newline at end of file
@@ -1,48 +1,100 @@
-import spacy
-from typing import List, Dict, Any
+import os
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from .nlp import get_nlp, lemmatized_text, LEMMA_EXCLUDE, SPACY_BATCH_SIZE
+from .ranker import DENSE_SCORING_BUDGET
+
+# Number of lemmatized job texts kept between searches
+JOB_TEXT_CACHE_SIZE = int(os.getenv("HIREAI_JOB_TEXT_CACHE_SIZE", "10000"))
 
 class JobSearch:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+        # Rows come out L2-normalized so cosine similarity reduces to a dot product
+        # float32 halves the bytes moved per query and is ample precision for ranking
+        self.vectorizer = TfidfVectorizer(stop_words='english', norm='l2', dtype=np.float32)
+        self._text_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._job_matrix = None
+        self._job_dense = None
+        self._job_hash = None
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp(LEMMA_EXCLUDE)
+
+    def search(self, query: str, jobs: List[Dict[str, Any]] = None,
+               top_k: Optional[int] = 50) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Search jobs using natural language query
 
-    def search(self, query: str, jobs: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search jobs using natural language query"""
+        Args:
+            query (str): Natural language search query
+            jobs (List[Dict[str, Any]]): Jobs to search, defaults to the sample jobs
+            top_k (Optional[int]): Only return the best top_k jobs; None returns all of them
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: (job, score) pairs, best match first.
+                The job dicts are the caller's own objects, not copies.
+        """
         if not jobs:
             # In a real application, you would fetch jobs from the database
             jobs = self._get_sample_jobs()
 
         # Prepare job texts
-        job_texts = [self._prepare_job_text(job) for job in jobs]
-
-        # Add query to the corpus
-        all_texts = job_texts + [query]
+        job_texts = self._prepare_job_texts(jobs)
 
-        # Create TF-IDF matrix
-        tfidf_matrix = self.vectorizer.fit_transform(all_texts)
+        # Refit the vocabulary and IDF weights only when the job corpus changes
+        corpus_hash = hash(tuple(job_texts))
+        if self._job_matrix is None or corpus_hash != self._job_hash:
+            self._job_matrix = self.vectorizer.fit_transform(job_texts).tocsr()
+            self._job_hash = corpus_hash
+            # Small corpora are scored with a dense BLAS matrix-vector product
+            rows, columns = self._job_matrix.shape
+            self._job_dense = self._job_matrix.toarray() if rows * columns * 4 <= DENSE_SCORING_BUDGET else None
 
         # Calculate similarity scores
-        query_vector = tfidf_matrix[-1]
-        job_vectors = tfidf_matrix[:-1]
-        similarity_scores = cosine_similarity(job_vectors, query_vector).flatten()
+        query_vector = self.vectorizer.transform([query])
+        if self._job_dense is not None:
+            similarity_scores = self._job_dense @ query_vector.toarray().ravel()
+        else:
+            similarity_scores = (self._job_matrix @ query_vector.T).toarray().ravel()
+
+        # Order by score in descending order, only fully sorting the jobs returned
+        if top_k is not None and 0 < top_k < len(jobs):
+            top = np.argpartition(-similarity_scores, top_k - 1)[:top_k]
+            order = top[np.argsort(-similarity_scores[top], kind='stable')]
+        else:
+            order = np.argsort(-similarity_scores, kind='stable')
+
+        # Pair each job with its score
+        return [(jobs[i], float(similarity_scores[i])) for i in order]
+
+    def _prepare_job_texts(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        """Prepare job texts for comparison, lemmatizing only jobs not seen before"""
+        raw_texts = [self._join_job_parts(job) for job in jobs]
+        missing = list(dict.fromkeys(text for text in raw_texts if text not in self._text_cache))
+
+        if missing:
+            # Lemmatize all new jobs in a single batched spaCy pass
+            docs = self.nlp.pipe(missing, batch_size=SPACY_BATCH_SIZE)
+            for text, doc in zip(missing, docs):
+                # Remove stop words and lemmatize
+                self._text_cache[text] = lemmatized_text(doc)
 
-        # Add scores to jobs
-        scored_jobs = []
-        for job, score in zip(jobs, similarity_scores):
-            job_copy = job.copy()
-            job_copy['score'] = float(score)
-            scored_jobs.append(job_copy)
+        cleaned_texts = []
+        for text in raw_texts:
+            self._text_cache.move_to_end(text)
+            cleaned_texts.append(self._text_cache[text])
 
-        # Sort by score in descending order
-        scored_jobs.sort(key=lambda x: x['score'], reverse=True)
+        while len(self._text_cache) > JOB_TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
 
-        return scored_jobs
+        return cleaned_texts
 
-    def _prepare_job_text(self, job: Dict[str, Any]) -> str:
-        """Prepare job text for comparison"""
+    def _join_job_parts(self, job: Dict[str, Any]) -> str:
+        """Join the searchable fields of a job into one string"""
         text_parts = []
 
         # Add job details
@@ -56,14 +108,7 @@ class JobSearch:
         if 'requirements' in job:
             text_parts.extend(job['requirements'])
 
-        # Join all parts and clean
-        text = ' '.join(text_parts)
-        doc = self.nlp(text)
-        
-        # Remove stop words and lemmatize
-        cleaned_text = ' '.join([token.lemma_ for token in doc if not token.is_stop])
-        
-        return cleaned_text
+        return ' '.join(text_parts)
 
     def _get_sample_jobs(self) -> List[Dict[str, Any]]:
         """Return sample jobs for testing"""
@@ -1,130 +1,302 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+import httpx
+import joblib
 import numpy as np
+from collections import OrderedDict
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any, Tuple, Union
-import openai
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Any, Tuple, Union, Optional
 import os
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 from ..config.azure_config import (
     AZURE_ENDPOINT,
     AZURE_MODEL_NAME,
-    AZURE_DEPLOYMENT,
+    AZURE_EMBEDDING_DEPLOYMENT,
     AZURE_SUBSCRIPTION_KEY,
     AZURE_API_VERSION
 )
 
+# Number of embeddings kept in memory, keyed by text and deployment
+EMBEDDING_CACHE_SIZE = int(os.getenv("HIREAI_EMBEDDING_CACHE_SIZE", "10000"))
+
+# Optional SQLite file that persists embeddings across processes
+EMBEDDING_CACHE_PATH = os.getenv("HIREAI_EMBEDDING_CACHE")
+
+# Optional joblib file that persists the fitted TF-IDF vectorizer across processes
+TFIDF_VECTORIZER_PATH = os.getenv("HIREAI_TFIDF_VECTORIZER")
+
+# Number of texts sent per Azure OpenAI embeddings request
+EMBEDDING_BATCH_SIZE = 64
+
+# Maximum number of embeddings requests in flight at once
+EMBEDDING_CONCURRENCY = 5
+
+# Connection pool and timeouts for embeddings requests; keep-alive connections
+# are reused so short texts do not each pay for a TLS handshake
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# Minimum cosine similarity between job embeddings for a cached ranking to be reused
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("HIREAI_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+# Seconds a cached ranking stays valid, so candidate updates are eventually picked up
+SEMANTIC_CACHE_TTL = float(os.getenv("HIREAI_SEMANTIC_CACHE_TTL", "3600"))
+
+# Number of job rankings kept in the semantic cache
+SEMANTIC_CACHE_SIZE = 256
+
+# Weight of each detailed score in the overall similarity
+SCORE_WEIGHTS = {'skills': 0.6, 'location': 0.2, 'experience': 0.2}
+
+class EmbeddingCache:
+    """Content-addressed embedding store: an in-memory LRU backed by an optional SQLite file"""
+
+    def __init__(self, path: Optional[str] = None, max_size: int = EMBEDDING_CACHE_SIZE):
+        self.max_size = max_size
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB)")
+
+    @staticmethod
+    def key(text: str, model: str) -> bytes:
+        """Digest identifying an embedding of text produced by model"""
+        return hashlib.blake2b(f"{model}|{text}".encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the cached vectors for whichever keys are present"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            missing = [key for key in keys if key not in found]
+            if self._db is not None:
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+        return found
+
+    def put_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        """Store vectors in memory and, when configured, on disk"""
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self._db is not None and items:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+                    )
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def _get_client() -> AzureOpenAI:
+    """Shared Azure OpenAI client so every calculator reuses the same connection pool"""
+    return AzureOpenAI(
+        api_key=AZURE_SUBSCRIPTION_KEY,
+        api_version=AZURE_API_VERSION,
+        azure_endpoint=AZURE_ENDPOINT,
+        http_client=httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    )
+
+
+class SemanticCache:
+    """Recent results keyed by normalized query embeddings, matched by cosine similarity"""
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, ttl: float = SEMANTIC_CACHE_TTL,
+                 max_size: int = SEMANTIC_CACHE_SIZE):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_size = max_size
+        self._vectors: List[np.ndarray] = []
+        self._values: List[Any] = []
+        self._times: List[float] = []
+
+    def get(self, vector: np.ndarray) -> Optional[Any]:
+        """Return the value stored for the closest query above the threshold, if any"""
+        self._expire()
+        if not self._vectors:
+            return None
+        similarities = np.stack(self._vectors) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return self._values[best]
+        return None
+
+    def put(self, vector: np.ndarray, value: Any) -> None:
+        """Remember a value for a query embedding, evicting the oldest entry when full"""
+        self._expire()
+        self._vectors.append(vector)
+        self._values.append(value)
+        self._times.append(time.monotonic())
+        if len(self._vectors) > self.max_size:
+            del self._vectors[0], self._values[0], self._times[0]
+
+    def clear(self) -> None:
+        self._vectors.clear()
+        self._values.clear()
+        self._times.clear()
+
+    def _expire(self) -> None:
+        # Entries are appended in time order, so expired ones form a prefix
+        cutoff = time.monotonic() - self.ttl
+        expired = 0
+        while expired < len(self._times) and self._times[expired] < cutoff:
+            expired += 1
+        if expired:
+            del self._vectors[:expired], self._values[:expired], self._times[:expired]
+
+
 class SimilarityCalculator:
-    def __init__(self, method: str = "tfidf"):
+    def __init__(self, method: str = "tfidf", deployment: str = AZURE_EMBEDDING_DEPLOYMENT):
         """
         Initialize the similarity calculator
         
         Args:
             method (str): Method to use for similarity calculation ("tfidf" or "embeddings")
+            deployment (str): Azure OpenAI embedding deployment used by the "embeddings" method
         """
         self.method = method
         
         if method == "tfidf":
-            self.vectorizer = TfidfVectorizer()
+            self.vectorizer = TfidfVectorizer(dtype=np.float32)
+            self._fitted = False
+            self._corpus_key = None
+            self._analyzer = None
+            # A saved index is only adopted once a corpus with the same key is fitted
+            self._saved_index = None
+            if TFIDF_VECTORIZER_PATH and os.path.exists(TFIDF_VECTORIZER_PATH):
+                self._saved_index = self._load_vectorizer(TFIDF_VECTORIZER_PATH)
         elif method == "embeddings":
             # Initialize Azure OpenAI client
-            self.client = AzureOpenAI(
-                api_key=AZURE_SUBSCRIPTION_KEY,
-                api_version=AZURE_API_VERSION,
-                azure_endpoint=AZURE_ENDPOINT
-            )
-            self.deployment = AZURE_DEPLOYMENT
+            self.client = _get_client()
+            self.deployment = deployment
+            self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+            self._field_matrices = {}
+            self._matrix_key = None
+            self.semantic_cache = SemanticCache()
         else:
             raise ValueError("Invalid method. Use 'tfidf' or 'embeddings'")
 
-    def calculate_similarity(self, job_query: str, candidate_skills: List[str]) -> float:
+    def get_or_compute_many(self, texts: List[str]) -> np.ndarray:
         """
-        Calculate similarity between job query and candidate skills
+        Get L2-normalized embeddings, only requesting texts that are not cached
         
         Args:
-            job_query (str): Job query text
-            candidate_skills (List[str]): List of candidate skills
+            texts (List[str]): Texts to embed
             
         Returns:
-            float: Similarity score between 0 and 1
+            np.ndarray: One float32 row per text, in input order
         """
-        if self.method == "tfidf":
-            return self._calculate_tfidf_similarity(job_query, candidate_skills)
-        else:
-            return self._calculate_embedding_similarity(job_query, candidate_skills)
-
-    def _calculate_tfidf_similarity(self, job_query: str, candidate_skills: List[str]) -> float:
-        """Calculate similarity using TF-IDF"""
-        # Combine candidate skills into a single string
-        candidate_text = " ".join(candidate_skills)
-        
-        # Create TF-IDF matrix
-        tfidf_matrix = self.vectorizer.fit_transform([job_query, candidate_text])
+        keys = [EmbeddingCache.key(text, self.deployment) for text in texts]
+        found = self.embedding_cache.get_many(list(dict.fromkeys(keys)))
         
-        # Calculate cosine similarity
-        similarity = (tfidf_matrix * tfidf_matrix.T).toarray()[0, 1]
+        misses = {}
+        for text, key in zip(texts, keys):
+            if key not in found:
+                misses.setdefault(key, text)
+        if misses:
+            computed = dict(zip(misses, self._get_embeddings(list(misses.values()))))
+            self.embedding_cache.put_many(computed)
+            found.update(computed)
         
-        return float(similarity)
+        return np.stack([found[key] for key in keys])
 
-    def _calculate_embedding_similarity(self, job_query: str, candidate_skills: List[str]) -> float:
-        """Calculate similarity using Azure OpenAI embeddings"""
+    def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get L2-normalized embeddings for many texts in batched Azure OpenAI requests"""
         try:
-            # Get embeddings for job query
-            query_embedding = self._get_embedding(job_query)
-            
-            # Get embeddings for candidate skills
-            candidate_text = " ".join(candidate_skills)
-            candidate_embedding = self._get_embedding(candidate_text)
-            
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(query_embedding, candidate_embedding)
-            
-            return float(similarity)
+            chunks = [texts[start:start + EMBEDDING_BATCH_SIZE]
+                      for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+            if len(chunks) > 1 and not self._in_event_loop():
+                # Several batches: send them concurrently
+                batches = asyncio.run(self._aget_embeddings(chunks))
+            else:
+                batches = [self._embedding_vectors(self.client.embeddings.create(
+                    model=self.deployment,
+                    input=chunk
+                )) for chunk in chunks]
             
+            matrix = np.asarray([vector for batch in batches for vector in batch], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return matrix / norms
         except Exception as e:
-            raise Exception(f"Error calculating embedding similarity: {str(e)}")
+            raise Exception(f"Error getting embeddings: {str(e)}")
 
-    def _get_embedding(self, text: str) -> List[float]:
-        """Get embedding from Azure OpenAI"""
-        try:
-            response = self.client.embeddings.create(
-                model=self.deployment,
-                input=text
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            raise Exception(f"Error getting embedding: {str(e)}")
-
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        
-        # Calculate dot product
-        dot_product = np.dot(vec1, vec2)
-        
-        # Calculate magnitudes
-        magnitude1 = np.sqrt(np.sum(vec1 ** 2))
-        magnitude2 = np.sqrt(np.sum(vec2 ** 2))
+    async def _aget_embeddings(self, chunks: List[List[str]]) -> List[List[List[float]]]:
+        """Request embedding batches concurrently, at most EMBEDDING_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
         
-        # Calculate cosine similarity
-        similarity = dot_product / (magnitude1 * magnitude2)
-        
-        return float(similarity)
+        # The async client's connections belong to this event loop, so it lives
+        # only as long as the asyncio.run call that created it
+        async with AsyncAzureOpenAI(
+            api_key=AZURE_SUBSCRIPTION_KEY,
+            api_version=AZURE_API_VERSION,
+            azure_endpoint=AZURE_ENDPOINT,
+            http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        ) as client:
+            async def embed(chunk: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    response = await client.embeddings.create(model=self.deployment, input=chunk)
+                return self._embedding_vectors(response)
+            
+            return await asyncio.gather(*[embed(chunk) for chunk in chunks])
+
+    @staticmethod
+    def _embedding_vectors(response) -> List[List[float]]:
+        """Embedding vectors of a response in input order"""
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Whether this thread is already running an event loop, where asyncio.run is not allowed"""
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
 
     def calculate_similarity(self, 
-                           job_info: Dict[str, Any], 
-                           candidate: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+                           job_info: Union[Dict[str, Any], str], 
+                           candidate: Union[Dict[str, Any], List[str]]) -> Tuple[float, Dict[str, float]]:
         """
         Calculate similarity between job requirements and candidate profile
         
         Args:
-            job_info (Dict[str, Any]): Structured job information
-            candidate (Dict[str, Any]): Candidate profile
+            job_info (Union[Dict[str, Any], str]): Structured job information, or a job query
+                whose words are compared as skills
+            candidate (Union[Dict[str, Any], List[str]]): Candidate profile, or a list of skills
             
         Returns:
             Tuple[float, Dict[str, float]]: Overall similarity score and detailed scores
         """
+        if isinstance(job_info, str):
+            job_info = {'skills': job_info.split()}
+        if isinstance(candidate, list):
+            candidate = {'skills': candidate}
+            
         if self.method == "tfidf":
             return self._calculate_tfidf_similarity(job_info, candidate)
         else:
@@ -134,18 +306,6 @@ class SimilarityCalculator:
                                   job_info: Dict[str, Any], 
                                   candidate: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
         """Calculate similarity using TF-IDF"""
-        # Prepare text for vectorization
-        job_text = self._prepare_text_for_tfidf(job_info)
-        candidate_text = self._prepare_text_for_tfidf(candidate)
-        
-        # Create TF-IDF vectors
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([job_text, candidate_text])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except ValueError:
-            # Handle case where vocabulary is empty
-            similarity = 0.0
-        
         # Calculate detailed scores
         detailed_scores = {
             'skills': self._calculate_skills_similarity(job_info.get('skills', []), 
@@ -156,28 +316,12 @@ class SimilarityCalculator:
                                                              candidate.get('experience_level', ''))
         }
         
-        # Calculate weighted average
-        weights = {'skills': 0.6, 'location': 0.2, 'experience': 0.2}
-        weighted_score = sum(score * weights[category] 
-                           for category, score in detailed_scores.items())
-        
-        return weighted_score, detailed_scores
+        return self._weighted_score(detailed_scores), detailed_scores
 
     def _calculate_embedding_similarity(self, 
                                       job_info: Dict[str, Any], 
                                       candidate: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
-        """Calculate similarity using sentence embeddings"""
-        # Prepare text for embedding
-        job_text = self._prepare_text_for_embedding(job_info)
-        candidate_text = self._prepare_text_for_embedding(candidate)
-        
-        # Get embeddings
-        job_embedding = self.model.encode(job_text)
-        candidate_embedding = self.model.encode(candidate_text)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity([job_embedding], [candidate_embedding])[0][0]
-        
+        """Calculate similarity using Azure OpenAI embeddings"""
         # Calculate detailed scores using embeddings
         detailed_scores = {
             'skills': self._calculate_skills_embedding_similarity(
@@ -194,42 +338,218 @@ class SimilarityCalculator:
             )
         }
         
-        # Calculate weighted average
-        weights = {'skills': 0.6, 'location': 0.2, 'experience': 0.2}
-        weighted_score = sum(score * weights[category] 
-                           for category, score in detailed_scores.items())
-        
-        return weighted_score, detailed_scores
+        return self._weighted_score(detailed_scores), detailed_scores
 
-    def _prepare_text_for_tfidf(self, data: Dict[str, Any]) -> str:
-        """Prepare text for TF-IDF vectorization"""
-        text_parts = []
-        
-        if 'skills' in data:
-            text_parts.extend(data['skills'])
+    @staticmethod
+    def _weighted_score(detailed_scores: Dict[str, float]) -> float:
+        """Weighted average of the detailed scores as a single float expression"""
+        return float(SCORE_WEIGHTS['skills'] * detailed_scores['skills']
+                     + SCORE_WEIGHTS['location'] * detailed_scores['location']
+                     + SCORE_WEIGHTS['experience'] * detailed_scores['experience'])
+
+    def score_candidates(self, job_info: Dict[str, Any], candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Score many candidates against one job
         
-        if 'location' in data:
-            text_parts.append(data['location'])
+        Args:
+            job_info (Dict[str, Any]): Structured job information
+            candidates (List[Dict[str, Any]]): Candidate profiles
             
-        if 'experience_level' in data:
-            text_parts.append(data['experience_level'])
+        Returns:
+            np.ndarray: Weighted similarity score per candidate, in input order
+        """
+        if not candidates:
+            return np.zeros(0, dtype=np.float32)
             
-        return ' '.join(text_parts)
-
-    def _prepare_text_for_embedding(self, data: Dict[str, Any]) -> str:
-        """Prepare text for sentence embedding"""
-        text_parts = []
+        # Each field joined into one text, one list per field
+        job_texts = {
+            'skills': ' '.join(job_info.get('skills', [])),
+            'location': job_info.get('location', '') or '',
+            'experience': job_info.get('experience_level', '') or ''
+        }
+        candidate_texts = {
+            'skills': [' '.join(candidate.get('skills', [])) for candidate in candidates],
+            'location': [candidate.get('location', '') or '' for candidate in candidates],
+            'experience': [candidate.get('experience_level', '') or '' for candidate in candidates]
+        }
         
-        if 'skills' in data:
-            text_parts.append(f"Skills: {', '.join(data['skills'])}")
+        if self.method == "tfidf":
+            # The job is transformed under the candidate fit, so the pool is fitted once.
+            # Scores use the corpus IDF only: unlike calculate_similarity, terms outside
+            # the candidate vocabulary are not given a per-pair fit and contribute nothing
+            self.fit_corpus(candidates)
+            scores = np.zeros(len(candidates), dtype=np.float32)
+            for field, job_text in job_texts.items():
+                if not job_text:
+                    continue
+                texts = candidate_texts[field]
+                if self._fitted:
+                    # One sparse matrix-vector product per field over all candidates;
+                    # empty texts transform to zero rows and score 0
+                    candidate_matrix = self.vectorizer.transform(texts)
+                    job_vector = self.vectorizer.transform([job_text])
+                    field_scores = (candidate_matrix @ job_vector.T).toarray().ravel()
+                else:
+                    field_scores = np.zeros(len(texts), dtype=np.float32)
+                # Texts equal to the job's up to case and surrounding whitespace score 1
+                job_key = job_text.strip().lower()
+                field_scores[[i for i, text in enumerate(texts) if text and text.strip().lower() == job_key]] = 1.0
+                scores += SCORE_WEIGHTS[field] * field_scores
+            return scores
         
-        if 'location' in data:
-            text_parts.append(f"Location: {data['location']}")
-            
-        if 'experience_level' in data:
-            text_parts.append(f"Experience Level: {data['experience_level']}")
+        # Empty job fields score 0 against every candidate
+        job_fields = [field for field, text in job_texts.items() if text]
+        if not job_fields:
+            return np.zeros(len(candidates), dtype=np.float32)
+        job_embeddings = self.get_or_compute_many([job_texts[field] for field in job_fields])
+        job_vectors = {field: np.zeros(job_embeddings.shape[1], dtype=np.float32) for field in job_texts}
+        job_vectors.update(zip(job_fields, job_embeddings))
+        
+        # Cached rankings only hold for the pool they were computed against
+        matrix_key = hash(tuple(tuple(texts) for texts in candidate_texts.values()))
+        if matrix_key != self._matrix_key:
+            self.semantic_cache.clear()
+        
+        # Weighting each field by the square root of its score weight makes the cosine
+        # between two job keys the weighted sum of their per-field cosines; a hit is
+        # answered from the job embeddings alone, before any candidate is embedded
+        job_key = np.concatenate([np.sqrt(SCORE_WEIGHTS[field]) * job_vectors[field] for field in job_texts])
+        norm = np.linalg.norm(job_key)
+        if norm:
+            job_key /= norm
+            cached = self.semantic_cache.get(job_key)
+            if cached is not None:
+                return cached.copy()
+        
+        # Candidate-side matrices are kept while the same pool is scored against new jobs
+        if matrix_key != self._matrix_key:
+            self._build_field_matrices(candidate_texts, job_embeddings.shape[1])
+            self._matrix_key = matrix_key
+        
+        # One matrix-vector product per field, combined into the final weighted score
+        scores = (SCORE_WEIGHTS['skills'] * (self._field_matrices['skills'] @ job_vectors['skills'])
+                  + SCORE_WEIGHTS['location'] * (self._field_matrices['location'] @ job_vectors['location'])
+                  + SCORE_WEIGHTS['experience'] * (self._field_matrices['experience'] @ job_vectors['experience']))
+        if norm:
+            self.semantic_cache.put(job_key, scores.copy())
+        return scores
+
+    def _build_field_matrices(self, candidate_texts: Dict[str, List[str]], dimensions: int) -> None:
+        """Embed every distinct candidate text in as few requests as possible, one matrix per field"""
+        unique_texts = list(dict.fromkeys(
+            text for texts in candidate_texts.values() for text in texts if text
+        ))
+        embeddings = self.get_or_compute_many(unique_texts) if unique_texts else None
+        rows = {text: row for row, text in enumerate(unique_texts)}
+        self._field_matrices = {}
+        for field, texts in candidate_texts.items():
+            # Empty texts stay zero rows, so they score 0
+            field_matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+            present = [i for i, text in enumerate(texts) if text]
+            if present:
+                field_matrix[present] = embeddings[[rows[texts[i]] for i in present]]
+            self._field_matrices[field] = field_matrix
+
+    def top_candidates(self, job_info: Dict[str, Any], candidates: List[Dict[str, Any]],
+                       top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return the best matching candidates for a job, highest score first
+        
+        Args:
+            job_info (Dict[str, Any]): Structured job information
+            candidates (List[Dict[str, Any]]): Candidate profiles
+            top_k (Optional[int]): Number of candidates to return, all when None
             
-        return ' '.join(text_parts)
+        Returns:
+            List[Dict[str, Any]]: Copies of the selected candidates with a 'score' key
+        """
+        scores = self.score_candidates(job_info, candidates)
+        if top_k is not None and 0 < top_k < len(scores):
+            # Partial selection is linear in the pool; only the top k are sorted
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            order = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+        return [{**candidates[i], 'score': float(scores[i])} for i in order]
+
+    def _prepare_text_for_tfidf(self, data: Dict[str, Any]) -> str:
+        """Prepare text for TF-IDF vectorization"""
+        # Missing fields only leave extra spaces, which the tokenizer ignores
+        return f"{' '.join(data.get('skills', ()))} {data.get('location') or ''} {data.get('experience_level') or ''}".strip()
+
+    def fit_corpus(self, candidates: List[Dict[str, Any]]) -> None:
+        """
+        Fit the TF-IDF vocabulary and IDF weights once so later comparisons only transform
+        
+        Args:
+            candidates (List[Dict[str, Any]]): Candidate profiles to learn the vocabulary from;
+                jobs are only transformed, so a new job never triggers a refit
+        """
+        corpus = [self._prepare_text_for_tfidf(candidate) for candidate in candidates]
+        corpus_key = hashlib.blake2b('\0'.join(corpus).encode('utf-8'), digest_size=16).digest()
+        if self._fitted and corpus_key == self._corpus_key:
+            # Already fitted on this exact corpus
+            return
+        if self._saved_index and self._saved_index['corpus_key'] == corpus_key:
+            # Fitted on this exact corpus by build_index, possibly in an earlier process
+            self.vectorizer = self._saved_index['vectorizer']
+        else:
+            # A fresh vectorizer, so a saved or earlier index is never refitted in place
+            self.vectorizer = TfidfVectorizer(dtype=np.float32)
+            try:
+                self.vectorizer.fit(corpus)
+            except ValueError:
+                # Empty vocabulary; keep comparing pairs on the fly
+                self._fitted = False
+                self._corpus_key = None
+                return
+        self._fitted = True
+        self._corpus_key = corpus_key
+        self._analyzer = self.vectorizer.build_analyzer()
+
+    def build_index(self, candidates: List[Dict[str, Any]], path: Optional[str] = TFIDF_VECTORIZER_PATH) -> None:
+        """
+        Fit the TF-IDF vectorizer on a candidate pool and save it for later processes
+        
+        Args:
+            candidates (List[Dict[str, Any]]): Candidate profiles to learn the vocabulary from
+            path (Optional[str]): joblib file to write, HIREAI_TFIDF_VECTORIZER by default
+        """
+        self.fit_corpus(candidates)
+        if self._fitted and path:
+            joblib.dump({'corpus_key': self._corpus_key, 'vectorizer': self.vectorizer}, path, compress=3)
+            self._saved_index = {'corpus_key': self._corpus_key, 'vectorizer': self.vectorizer}
+
+    @staticmethod
+    def _load_vectorizer(path: str) -> Optional[Dict[str, Any]]:
+        """Read a vectorizer saved by build_index, with the key of the corpus it was fitted on"""
+        try:
+            return joblib.load(path)
+        except Exception:
+            # Unreadable file; the vectorizer is fitted again on first use
+            return None
+
+    def _in_vocabulary(self, *texts: str) -> bool:
+        """Whether every term of the texts is in the fitted vocabulary"""
+        vocabulary = self.vectorizer.vocabulary_
+        return all(term in vocabulary for text in texts for term in self._analyzer(text))
+
+    def _tfidf_similarity(self, text1: str, text2: str) -> float:
+        """Cosine similarity of two texts under the fitted vectorizer, or a pairwise fit without one"""
+        try:
+            if self._fitted and self._in_vocabulary(text1, text2):
+                tfidf_matrix = self.vectorizer.transform([text1, text2])
+            elif self._fitted:
+                # Terms unseen by the corpus fit would transform to nothing and score 0,
+                # so this pair is compared under its own fit; the corpus fit is kept
+                tfidf_matrix = TfidfVectorizer(dtype=np.float32).fit_transform([text1, text2])
+            else:
+                tfidf_matrix = self.vectorizer.fit_transform([text1, text2])
+        except ValueError:
+            # Handle case where vocabulary is empty
+            return 0.0
+        # Rows are L2-normalized, so their dot product is the cosine similarity
+        return float(tfidf_matrix[0].multiply(tfidf_matrix[1]).sum())
 
     def _calculate_skills_similarity(self, 
                                    job_skills: List[str], 
@@ -240,12 +560,11 @@ class SimilarityCalculator:
             
         job_skills_text = ' '.join(job_skills)
         candidate_skills_text = ' '.join(candidate_skills)
+        # The vectorizer lowercases, so identical texts up to case score 1
+        if job_skills_text.strip().lower() == candidate_skills_text.strip().lower():
+            return 1.0
         
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([job_skills_text, candidate_skills_text])
-            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except ValueError:
-            return 0.0
+        return self._tfidf_similarity(job_skills_text, candidate_skills_text)
 
     def _calculate_location_similarity(self, 
                                      job_location: str, 
@@ -253,12 +572,10 @@ class SimilarityCalculator:
         """Calculate similarity between job and candidate locations"""
         if not job_location or not candidate_location:
             return 0.0
+        if job_location.strip().lower() == candidate_location.strip().lower():
+            return 1.0
             
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([job_location, candidate_location])
-            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except ValueError:
-            return 0.0
+        return self._tfidf_similarity(job_location, candidate_location)
 
     def _calculate_experience_similarity(self, 
                                        job_experience: str, 
@@ -266,12 +583,10 @@ class SimilarityCalculator:
         """Calculate similarity between job and candidate experience levels"""
         if not job_experience or not candidate_experience:
             return 0.0
+        if job_experience.strip().lower() == candidate_experience.strip().lower():
+            return 1.0
             
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([job_experience, candidate_experience])
-            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except ValueError:
-            return 0.0
+        return self._tfidf_similarity(job_experience, candidate_experience)
 
     def _calculate_skills_embedding_similarity(self, 
                                              job_skills: List[str], 
@@ -282,11 +597,15 @@ class SimilarityCalculator:
             
         job_skills_text = ' '.join(job_skills)
         candidate_skills_text = ' '.join(candidate_skills)
+        # Identical texts share an embedding, so skip the lookup
+        if job_skills_text == candidate_skills_text:
+            return 1.0
         
-        job_embedding = self.model.encode(job_skills_text)
-        candidate_embedding = self.model.encode(candidate_skills_text)
+        # Both texts are looked up, and if needed embedded, in one pass
+        job_embedding, candidate_embedding = self.get_or_compute_many([job_skills_text, candidate_skills_text])
         
-        return cosine_similarity([job_embedding], [candidate_embedding])[0][0]
+        # Embeddings are L2-normalized, so the dot product is the cosine similarity
+        return float(np.dot(job_embedding, candidate_embedding))
 
     def _calculate_location_embedding_similarity(self, 
                                                job_location: str, 
@@ -294,11 +613,14 @@ class SimilarityCalculator:
         """Calculate similarity between job and candidate locations using embeddings"""
         if not job_location or not candidate_location:
             return 0.0
+        if job_location == candidate_location:
+            return 1.0
             
-        job_embedding = self.model.encode(job_location)
-        candidate_embedding = self.model.encode(candidate_location)
+        # Both texts are looked up, and if needed embedded, in one pass
+        job_embedding, candidate_embedding = self.get_or_compute_many([job_location, candidate_location])
         
-        return cosine_similarity([job_embedding], [candidate_embedding])[0][0]
+        # Embeddings are L2-normalized, so the dot product is the cosine similarity
+        return float(np.dot(job_embedding, candidate_embedding))
 
     def _calculate_experience_embedding_similarity(self, 
                                                  job_experience: str, 
@@ -306,8 +628,11 @@ class SimilarityCalculator:
         """Calculate similarity between job and candidate experience levels using embeddings"""
         if not job_experience or not candidate_experience:
             return 0.0
+        if job_experience == candidate_experience:
+            return 1.0
             
-        job_embedding = self.model.encode(job_experience)
-        candidate_embedding = self.model.encode(candidate_experience)
+        # Both texts are looked up, and if needed embedded, in one pass
+        job_embedding, candidate_embedding = self.get_or_compute_many([job_experience, candidate_experience])
         
-        return cosine_similarity([job_embedding], [candidate_embedding])[0][0] 
\ No newline at end of file
+        # Embeddings are L2-normalized, so the dot product is the cosine similarity
+        return float(np.dot(job_embedding, candidate_embedding)) 
\ No newline at end of file
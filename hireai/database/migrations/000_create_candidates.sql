@@ -0,0 +1,14 @@
+-- Candidates table used by SupabaseClient; run before the other migrations
+CREATE TABLE IF NOT EXISTS candidates (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL DEFAULT '',
+    email text NOT NULL DEFAULT '',
+    phone text NOT NULL DEFAULT '',
+    location text,
+    skills text[] NOT NULL DEFAULT '{}',
+    education jsonb NOT NULL DEFAULT '[]',
+    experience jsonb NOT NULL DEFAULT '[]',
+    years_of_experience numeric NOT NULL DEFAULT 0,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
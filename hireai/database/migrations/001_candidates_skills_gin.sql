@@ -0,0 +1,4 @@
+-- Index candidates.skills so array overlap (&&) and containment (@>) filters
+-- are answered from the index instead of a sequential scan
+CREATE INDEX IF NOT EXISTS candidates_skills_gin
+    ON candidates USING GIN (skills);
@@ -0,0 +1,36 @@
+-- Server-side candidate search: full-text search over skills and pgvector
+-- nearest-neighbour matching, so clients only receive the top rows
+
+-- array_to_string is only STABLE, so wrap it for use in a generated column
+CREATE OR REPLACE FUNCTION candidate_skills_tsvector(skills text[])
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT to_tsvector('english'::regconfig, coalesce(array_to_string(skills, ' '), ''))
+$$;
+
+ALTER TABLE candidates
+    ADD COLUMN IF NOT EXISTS skills_tsv tsvector
+    GENERATED ALWAYS AS (candidate_skills_tsvector(skills)) STORED;
+
+CREATE INDEX IF NOT EXISTS candidates_skills_tsv_gin
+    ON candidates USING GIN (skills_tsv);
+
+-- Embeddings are 1536-dimensional, matching the Azure OpenAI embedding deployment
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE candidates
+    ADD COLUMN IF NOT EXISTS embedding vector(1536);
+
+CREATE INDEX IF NOT EXISTS candidates_embedding_hnsw
+    ON candidates USING hnsw (embedding vector_cosine_ops);
+
+-- Candidates ordered by cosine distance to the query embedding
+CREATE OR REPLACE FUNCTION match_candidates(query_embedding vector(1536), match_count int DEFAULT 10)
+RETURNS SETOF candidates
+LANGUAGE sql STABLE AS $$
+    SELECT *
+    FROM candidates
+    WHERE embedding IS NOT NULL
+    ORDER BY embedding <=> query_embedding
+    LIMIT match_count
+$$;
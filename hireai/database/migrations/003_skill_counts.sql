@@ -0,0 +1,24 @@
+-- Skill aggregates computed in Postgres so charts receive counts instead of
+-- every candidate row
+
+-- Occurrences of each lowercased skill, most common first
+CREATE OR REPLACE FUNCTION skill_counts(max_rows int DEFAULT NULL, min_count int DEFAULT 1)
+RETURNS TABLE (skill text, n bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT lower(s), count(*)
+    FROM candidates, unnest(skills) AS s
+    GROUP BY 1
+    HAVING count(*) >= min_count
+    ORDER BY 2 DESC, 1
+    LIMIT max_rows
+$$;
+
+-- Co-occurrence counts for every ordered pair of the given lowercased skills
+CREATE OR REPLACE FUNCTION skill_pair_counts(skill_list text[])
+RETURNS TABLE (skill_a text, skill_b text, n bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT lower(a), lower(b), count(*)
+    FROM candidates, unnest(skills) AS a, unnest(skills) AS b
+    WHERE lower(a) = ANY(skill_list) AND lower(b) = ANY(skill_list)
+    GROUP BY 1, 2
+$$;
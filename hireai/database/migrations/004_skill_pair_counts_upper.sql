@@ -0,0 +1,16 @@
+-- Co-occurrence is symmetric, so count each unordered pair of the given
+-- lowercased skills once (skill_a <= skill_b) and let the client mirror it.
+-- Occurrences are filtered to the requested skills before the self-join.
+CREATE OR REPLACE FUNCTION skill_pair_counts(skill_list text[])
+RETURNS TABLE (skill_a text, skill_b text, n bigint)
+LANGUAGE sql STABLE AS $$
+    WITH occurrences AS (
+        SELECT c.id, lower(s) AS skill
+        FROM candidates c, unnest(c.skills) AS s
+        WHERE lower(s) = ANY(skill_list)
+    )
+    SELECT x.skill, y.skill, count(*)
+    FROM occurrences x
+    JOIN occurrences y ON x.id = y.id AND x.skill <= y.skill
+    GROUP BY 1, 2
+$$;
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -27,8 +27,8 @@ class Candidate(BaseModel):
     skills: List[str]
     education: List[Education]
     experience: List[Experience]
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
 
 class Job(BaseModel):
     id: Optional[str]
@@ -38,5 +38,5 @@ class Job(BaseModel):
     description: str
     requirements: List[str]
     salary_range: Optional[str]
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now() 
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now) 
\ No newline at end of file
@@ -1,11 +1,14 @@
 import os
 from supabase import create_client, Client
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .models import Candidate, Job
 from datetime import datetime
 import json
 from ..config.supabase_config import SUPABASE_URL, SUPABASE_KEY
 
+# Rows sent per bulk insert request, kept well under PostgREST payload limits
+INSERT_BATCH_SIZE = 500
+
 class SupabaseClient:
     def __init__(self):
         """Initialize Supabase client"""
@@ -13,41 +16,12 @@ class SupabaseClient:
             raise ValueError("Missing Supabase credentials. Please check your supabase_config.py file.")
         
         self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        self._create_candidates_table()
-
-    def _create_candidates_table(self):
-        """Create candidates table if it doesn't exist"""
-        try:
-            # Check if table exists by trying to select from it
-            self.client.table('candidates').select('id').limit(1).execute()
-        except Exception:
-            # Table doesn't exist, create it
-            self.client.table('candidates').insert({
-                'name': 'test',
-                'email': 'test@example.com',
-                'phone': '1234567890',
-                'skills': [],
-                'education': [],
-                'experience': [],
-                'years_of_experience': 0  # Changed from total_experience to years_of_experience
-            }).execute()
-            
-            # Delete the test record
-            self.client.table('candidates').delete().eq('email', 'test@example.com').execute()
 
     def insert_candidate(self, candidate_data: Dict[str, Any]) -> str:
         """Insert a new candidate into the database"""
         try:
             # Prepare the data for insertion
-            data = {
-                'name': candidate_data.get('name', ''),
-                'email': candidate_data.get('email', ''),
-                'phone': candidate_data.get('phone', ''),
-                'skills': candidate_data.get('skills', []),
-                'education': candidate_data.get('education', []),
-                'experience': candidate_data.get('experience', []),
-                'years_of_experience': candidate_data.get('total_experience', 0)  # Map total_experience to years_of_experience
-            }
+            data = self._candidate_row(candidate_data)
             
             # Insert the candidate
             response = self.client.table('candidates').insert(data).execute()
@@ -60,6 +34,44 @@ class SupabaseClient:
         except Exception as e:
             raise Exception(f"Error inserting candidate: {str(e)}")
 
+    def insert_candidates(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert many candidates with one request per INSERT_BATCH_SIZE rows
+
+        Args:
+            rows (List[Dict[str, Any]]): Candidate data as accepted by insert_candidate
+
+        Returns:
+            List[str]: Ids of the inserted candidates, in input order
+        """
+        try:
+            data = [self._candidate_row(row) for row in rows]
+            ids = []
+            for start in range(0, len(data), INSERT_BATCH_SIZE):
+                response = self.client.table('candidates').insert(data[start:start + INSERT_BATCH_SIZE]).execute()
+                if not response.data:
+                    raise Exception("No data returned from insert operation")
+                ids.extend(r['id'] for r in response.data)
+            return ids
+        except Exception as e:
+            raise Exception(f"Error inserting candidates: {str(e)}")
+
+    @staticmethod
+    def _candidate_row(candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map parsed candidate data onto the candidates table columns"""
+        row = {
+            'name': candidate_data.get('name', ''),
+            'email': candidate_data.get('email', ''),
+            'phone': candidate_data.get('phone', ''),
+            'skills': candidate_data.get('skills', []),
+            'education': candidate_data.get('education', []),
+            'experience': candidate_data.get('experience', []),
+            'years_of_experience': candidate_data.get('total_experience', 0)  # Map total_experience to years_of_experience
+        }
+        if candidate_data.get('embedding') is not None:
+            row['embedding'] = [float(x) for x in candidate_data['embedding']]
+        return row
+
     def get_candidate(self, candidate_id: str) -> Dict[str, Any]:
         """Get a candidate by ID"""
         try:
@@ -70,23 +82,54 @@ class SupabaseClient:
         except Exception as e:
             raise Exception(f"Error getting candidate: {str(e)}")
 
-    def get_all_candidates(self) -> List[Dict[str, Any]]:
-        """Get all candidates"""
+    def get_all_candidates(self, columns: str = '*') -> List[Dict[str, Any]]:
+        """
+        Get all candidates, with skills always a list
+
+        Args:
+            columns (str): Comma separated columns to fetch; callers that only need a few
+                fields avoid transferring whole rows
+
+        Returns:
+            List[Dict[str, Any]]: Candidate rows
+        """
         try:
-            response = self.client.table('candidates').select('*').execute()
-            return response.data
+            response = self.client.table('candidates').select(columns).execute()
+            candidates = response.data
+            # Normalize once here so consumers can iterate skills without type checks
+            for candidate in candidates:
+                if not isinstance(candidate.get('skills'), list):
+                    candidate['skills'] = []
+            return candidates
         except Exception as e:
             raise Exception(f"Error getting candidates: {str(e)}")
 
-    def search_candidates(self, skills: List[str] = None, location: str = None, min_experience: int = None) -> List[Dict[str, Any]]:
-        """Search for candidates matching criteria"""
+    def search_candidates(self, skills: List[str] = None, location: str = None, min_experience: int = None,
+                          text_query: str = None, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Search for candidates matching criteria
+
+        Args:
+            skills (List[str]): Return candidates with any of these skills
+            location (str): Substring the candidate location must contain
+            min_experience (int): Minimum years of experience
+            text_query (str): Full-text query matched against the candidates' skills
+            limit (int): Maximum number of candidates to return
+
+        Returns:
+            List[Dict[str, Any]]: Matching candidate rows
+        """
         try:
             query = self.client.table('candidates').select('*')
             
+            if text_query:
+                # Match on the indexed skills tsvector in the database
+                query = query.text_search('skills_tsv', text_query, options={'config': 'english', 'type': 'websearch'})
+            
             if skills:
-                # Search for candidates with any of the required skills
-                for skill in skills:
-                    query = query.contains('skills', [skill])
+                # Search for candidates with any of the required skills in a single
+                # array-overlap filter, backed by the GIN index on skills
+                query = query.overlaps('skills', skills)
             
             if location:
                 # Search for candidates in the specified location
@@ -96,24 +139,76 @@ class SupabaseClient:
                 # Search for candidates with minimum years of experience
                 query = query.gte('years_of_experience', min_experience)
             
+            if limit is not None:
+                query = query.limit(limit)
+            
             response = query.execute()
             return response.data
         except Exception as e:
             raise Exception(f"Error searching candidates: {str(e)}")
 
+    def match_candidates(self, embedding: List[float], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the candidates whose stored embeddings are closest to a query embedding
+
+        Args:
+            embedding (List[float]): Query embedding
+            limit (int): Maximum number of candidates to return
+
+        Returns:
+            List[Dict[str, Any]]: Candidate rows ordered by cosine distance
+        """
+        try:
+            response = self.client.rpc('match_candidates', {
+                'query_embedding': [float(x) for x in embedding],
+                'match_count': limit
+            }).execute()
+            return response.data
+        except Exception as e:
+            raise Exception(f"Error matching candidates: {str(e)}")
+
+    def get_skill_counts(self, limit: int = None, min_count: int = 1) -> Dict[str, int]:
+        """
+        Count skill occurrences across all candidates in the database
+
+        Args:
+            limit (int): Maximum number of skills to return
+            min_count (int): Minimum number of occurrences to include a skill
+
+        Returns:
+            Dict[str, int]: Occurrences of each lowercased skill, most common first
+        """
+        try:
+            response = self.client.rpc('skill_counts', {
+                'max_rows': limit,
+                'min_count': min_count
+            }).execute()
+            return {row['skill']: row['n'] for row in response.data}
+        except Exception as e:
+            raise Exception(f"Error counting skills: {str(e)}")
+
+    def get_skill_pair_counts(self, skills: List[str]) -> Dict[Tuple[str, str], int]:
+        """
+        Count how often pairs of the given skills occur on the same candidate
+
+        Args:
+            skills (List[str]): Lowercased skills to pair up
+
+        Returns:
+            Dict[Tuple[str, str], int]: Co-occurrences of each skill pair that occurs, listed
+                once per unordered pair with the skills in sorted order
+        """
+        try:
+            response = self.client.rpc('skill_pair_counts', {'skill_list': list(skills)}).execute()
+            return {(row['skill_a'], row['skill_b']): row['n'] for row in response.data}
+        except Exception as e:
+            raise Exception(f"Error counting skill pairs: {str(e)}")
+
     def update_candidate(self, candidate_id: str, candidate_data: Dict[str, Any]) -> bool:
         """Update a candidate's information"""
         try:
             # Prepare the data for update
-            data = {
-                'name': candidate_data.get('name', ''),
-                'email': candidate_data.get('email', ''),
-                'phone': candidate_data.get('phone', ''),
-                'skills': candidate_data.get('skills', []),
-                'education': candidate_data.get('education', []),
-                'experience': candidate_data.get('experience', []),
-                'years_of_experience': candidate_data.get('total_experience', 0)  # Map total_experience to years_of_experience
-            }
+            data = self._candidate_row(candidate_data)
             
             response = self.client.table('candidates').update(data).eq('id', candidate_id).execute()
             return bool(response.data)
@@ -130,7 +225,8 @@ class SupabaseClient:
 
     def store_candidate(self, candidate_data: dict) -> str:
         """Store candidate data in Supabase"""
-        response = self.client.table("candidates").insert(candidate_data).execute()
+        # Parser output carries fields that are not columns, so map it like insert_candidate
+        response = self.client.table("candidates").insert(self._candidate_row(candidate_data)).execute()
         return response.data[0]["id"]
 
     def get_candidate_by_name(self, name: str) -> Optional[Candidate]:
@@ -140,11 +236,6 @@ class SupabaseClient:
             return Candidate(**response.data[0])
         return None
 
-    def get_all_candidates(self) -> List[Candidate]:
-        """Retrieve all candidates"""
-        response = self.client.table("candidates").select("*").execute()
-        return [Candidate(**data) for data in response.data]
-
     def store_job(self, job_data: dict) -> str:
         """Store job data in Supabase"""
         response = self.client.table("jobs").insert(job_data).execute()
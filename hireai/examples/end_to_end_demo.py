@@ -1,24 +1,94 @@
 import os
 import sys
+import logging
 import gradio as gr
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import copy
+import hashlib
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+import httpx
+import numpy as np
 from datetime import datetime
-from openai import AzureOpenAI
-import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+from openai import AzureOpenAI, RateLimitError, APITimeoutError, APIConnectionError
 
 # Add the project root to Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+logger = logging.getLogger(__name__)
+
 # Azure OpenAI Configuration
 AZURE_ENDPOINT = "https://openai-hackathonpoc-dev.openai.azure.com/"
 AZURE_MODEL_NAME = "gpt-35-turbo"
 AZURE_DEPLOYMENT = "hackathon-poc-turbo35"
-AZURE_API_KEY = "<APIKEY>"
+# Deployment for the embedding shortlist; chat deployments do not serve embeddings
+AZURE_EMBEDDING_DEPLOYMENT = os.getenv("AZURE_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
+AZURE_API_KEY = os.getenv("AZURE_API_KEY", "<APIKEY>")
 AZURE_API_VERSION = "2024-12-01-preview"
 
+# Instructions and response schema for the job requirements analysis
+JOB_ANALYSIS_SYSTEM_PROMPT = """You are a job analysis expert. Extract the key requirements from the job description and return only a JSON object with this structure:
+{
+    "required_skills": [<list of required technical skills>],
+    "required_experience": {"years": <number of years>, "level": <"Entry", "Mid", or "Senior">, "description": <detailed experience requirements>},
+    "required_education": {"degree": <required degree>, "field": <required field of study>, "description": <detailed education requirements>},
+    "responsibilities": [<list of key responsibilities>],
+    "preferred_qualifications": [<list of preferred qualifications>]
+}"""
+
+# Instructions and response schema for scoring a candidate against job requirements
+MATCH_SYSTEM_PROMPT = """You are a recruitment expert. Compare the candidate profile with the job requirements, focusing on skills and education and ignoring experience requirements. Give more score if 30 to 50 % of skills match. Return only a JSON object with this structure:
+{
+    "overall_score": <number between 0 and 100>,
+    "skill_matches": {"matched_skills": [<list of matched skills>], "unmatched_skills": [<list of unmatched skills>]},
+    "education_match": {"candidate_education": <candidate's education>, "required_education": <required education>, "match": <"High", "Medium", or "Low">},
+    "missing_requirements": [<list of missing requirements>]
+}"""
+
+# Completion token limits sized to each JSON schema; the job analysis carries free-text
+# descriptions and lists, the candidate match mostly skill names
+JOB_ANALYSIS_MAX_TOKENS = 1000
+MATCH_MAX_TOKENS = 600
+
+# Candidate match requests sent to Azure OpenAI at the same time
+MATCH_WORKERS = 10
+
+# Number of job requirement analyses kept in memory, keyed by job description hash
+JD_CACHE_SIZE = 256
+
+# Optional SQLite file that keeps job requirement analyses across restarts
+JD_CACHE_PATH = os.getenv("HIREAI_JD_CACHE")
+
+# Candidates covering less than this share of the required skills are not sent to Azure OpenAI
+PREFILTER_MIN_OVERLAP = 0.1
+
+# Candidates covering at least this share of the required skills match without an Azure OpenAI call
+PREFILTER_AUTO_MATCH = 0.9
+
+# Default number of candidates a search returns; only this many of the closest skill
+# embeddings go on to the detailed AI analysis
+MATCH_TOP_K = 20
+
+# Number of candidate/job match analyses kept in memory
+MATCH_CACHE_SIZE = 10000
+
+# Seconds between status checks while an Azure OpenAI batch job runs
+BATCH_POLL_INTERVAL = 30
+
+# Attempts per Azure OpenAI request on rate limits and timeouts, with exponential backoff
+MAX_RETRIES = 3
+
+# Keep-alive pool sized for the concurrent match requests so they reuse TLS connections
+HTTP_LIMITS = httpx.Limits(max_connections=MATCH_WORKERS * 2, max_keepalive_connections=MATCH_WORKERS)
+
 try:
     from hireai.core.resume_parser import ResumeParser
     from hireai.core.job_parser import JobRequestParser
@@ -33,22 +103,57 @@ except ImportError as e:
     print("3. All required dependencies are installed")
     sys.exit(1)
 
+@lru_cache(maxsize=None)
+def _get_azure_client() -> AzureOpenAI:
+    """Shared Azure OpenAI client so every demo instance reuses the same connection pool"""
+    return AzureOpenAI(
+        api_key=AZURE_API_KEY,
+        api_version=AZURE_API_VERSION,
+        azure_endpoint=AZURE_ENDPOINT,
+        http_client=httpx.Client(limits=HTTP_LIMITS)
+    )
+
+class TruncatedResponseError(ValueError):
+    """A JSON completion was cut off at its token limit"""
+
+def _to_dict(obj) -> Dict[str, Any]:
+    """Plain dictionary for a candidate given as a dict, a Pydantic model or another object"""
+    if isinstance(obj, dict):
+        return obj
+    dump = getattr(obj, "model_dump", None) or getattr(obj, "dict", None)
+    return dump() if dump else obj.__dict__
+
 class HireAIDemo:
     def __init__(self):
         """Initialize the HireAI demo with all components"""
         self.resume_parser = ResumeParser()
         self.job_parser = JobRequestParser()
         self.similarity_calculator = SimilarityCalculator()
+        # Embedding scorer used to shortlist candidates before the per-candidate AI analysis;
+        # it keeps the candidate embedding matrix between searches
+        self.embedding_calculator = SimilarityCalculator("embeddings", AZURE_EMBEDDING_DEPLOYMENT)
         self.supabase_client = SupabaseClient()
         self.skill_visualizer = SkillVisualizer()
         self.match_threshold = 0.5  # 50% match threshold
         
         # Initialize Azure OpenAI client
-        self.azure_client = AzureOpenAI(
-            api_key=AZURE_API_KEY,
-            api_version=AZURE_API_VERSION,
-            azure_endpoint=AZURE_ENDPOINT
-        )
+        self.azure_client = _get_azure_client()
+        
+        # Candidate rows fetched once and kept current as resumes are added
+        self._all_candidates: Optional[List[Dict[str, Any]]] = None
+        self._candidates_lock = threading.Lock()
+        
+        # Job requirement analyses keyed by a hash of the deployment and job description
+        self._jd_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._jd_lock = threading.Lock()
+        self._jd_db = None
+        if JD_CACHE_PATH:
+            self._jd_db = sqlite3.connect(JD_CACHE_PATH, check_same_thread=False)
+            self._jd_db.execute("CREATE TABLE IF NOT EXISTS jd_analyses (key TEXT PRIMARY KEY, analysis TEXT)")
+        
+        # Match analyses keyed by (candidate content hash, job requirements hash)
+        self._match_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._match_lock = threading.Lock()
         
         # Load sample resumes
         self.sample_resumes = self._load_sample_resumes()
@@ -56,19 +161,30 @@ class HireAIDemo:
     def _load_sample_resumes(self) -> List[Dict[str, Any]]:
         """Load sample resumes from the data directory"""
         sample_dir = os.path.join(project_root, "data", "sample_resumes")
-        resumes = []
+        if not os.path.exists(sample_dir):
+            return []
         
-        if os.path.exists(sample_dir):
-            for filename in os.listdir(sample_dir):
-                if filename.endswith(('.pdf', '.docx')):
-                    file_path = os.path.join(sample_dir, filename)
-                    try:
-                        resume_data = self.resume_parser.parse_resume(file_path)
-                        resumes.append(resume_data)
-                    except Exception as e:
-                        print(f"Error parsing {filename}: {str(e)}")
+        paths = [
+            os.path.join(sample_dir, filename)
+            for filename in os.listdir(sample_dir)
+            if filename.endswith(('.pdf', '.docx'))
+        ]
+        if not paths:
+            return []
         
-        return resumes
+        # Text extraction spends most of its time in C libraries, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(paths))) as executor:
+            results = list(executor.map(self._parse_sample_resume, paths))
+        
+        return [resume_data for resume_data in results if resume_data is not None]
+
+    def _parse_sample_resume(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Parse one sample resume, logging and skipping files that fail"""
+        try:
+            return self.resume_parser.parse_resume(file_path)
+        except Exception as e:
+            logger.warning("Error parsing %s: %s", os.path.basename(file_path), e)
+            return None
 
     def process_resume(self, resume_file, name, email, phone) -> Dict[str, Any]:
         """Process a resume file and store in database"""
@@ -92,6 +208,13 @@ class HireAIDemo:
             # Store in database
             candidate_id = self.supabase_client.insert_candidate(resume_data)
             resume_data['id'] = candidate_id
+            self.skill_visualizer.invalidate()
+            
+            # Keep the loaded candidate list current without refetching the table; the list is
+            # replaced rather than appended to so searches already iterating it are unaffected
+            with self._candidates_lock:
+                if self._all_candidates is not None:
+                    self._all_candidates = self._all_candidates + [dict(resume_data)]
             
             return {
                 "status": "success",
@@ -104,87 +227,61 @@ class HireAIDemo:
                 "message": str(e)
             }
 
+    def _candidates(self) -> List[Dict[str, Any]]:
+        """All candidates as dictionaries, fetched from the database on first use"""
+        with self._candidates_lock:
+            if self._all_candidates is None:
+                # Convert once here so scoring and display only ever see plain dictionaries
+                self._all_candidates = [_to_dict(candidate) for candidate in self.supabase_client.get_all_candidates()]
+            return self._all_candidates
+
+    def refresh_candidates(self) -> None:
+        """Drop the loaded candidate list so the next search refetches it"""
+        with self._candidates_lock:
+            self._all_candidates = None
+
     def analyze_job_requirements(self, job_description: str) -> Dict[str, Any]:
         """Analyze job requirements using Azure OpenAI"""
         try:
-            print("\n=== Starting Job Requirements Analysis ===")
+            logger.debug("=== Starting Job Requirements Analysis ===")
             if not job_description or not isinstance(job_description, str):
-                print("Invalid job description provided")
+                logger.debug("Invalid job description provided")
                 raise ValueError("Job description must be a non-empty string")
             
-            print(f"Job Description: {job_description[:200]}...")  # Print first 200 chars
-            
-            # Create a prompt for OpenAI
-            prompt = f"""
-            Analyze the following job description and extract key requirements.
-            You must return a valid JSON object with the following structure:
-            {{
-                "required_skills": [<list of required technical skills>],
-                "required_experience": {{
-                    "years": <number of years>,
-                    "level": <"Entry", "Mid", or "Senior">,
-                    "description": <detailed experience requirements>
-                }},
-                "required_education": {{
-                    "degree": <required degree>,
-                    "field": <required field of study>,
-                    "description": <detailed education requirements>
-                }},
-                "responsibilities": [<list of key responsibilities>],
-                "preferred_qualifications": [<list of preferred qualifications>]
-            }}
-
-            Job Description:
-            {job_description}
-
-            Remember to return ONLY the JSON object, no additional text or explanation.
-            """
-            
-            print("Sending request to Azure OpenAI...")
-            # Call Azure OpenAI API
-            response = self.azure_client.chat.completions.create(
-                model=AZURE_DEPLOYMENT,
-                messages=[
-                    {"role": "system", "content": "You are a job analysis expert. Extract and structure job requirements from descriptions. You must return a valid JSON object with the exact structure specified. Do not include any additional text or explanation."},
-                    {"role": "user", "content": prompt}
+            logger.debug("Job Description: %s...", job_description[:200])
+            
+            # Reuse the analysis of an identical job description
+            cache_key = self._jd_cache_key(job_description)
+            cached = self._get_cached_analysis(cache_key)
+            if cached is not None:
+                logger.debug("Using cached job requirements analysis")
+                return cached
+            
+            logger.debug("Sending request to Azure OpenAI...")
+            request = {
+                "model": AZURE_DEPLOYMENT,
+                "messages": [
+                    {"role": "system", "content": JOB_ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"Job Description:\n{job_description}"}
                 ],
-                temperature=0.3,
-                max_tokens=1000
-            )
+                "temperature": 0.3,
+                "max_tokens": JOB_ANALYSIS_MAX_TOKENS,
+                "response_format": {"type": "json_object"}
+            }
+            # Call Azure OpenAI API; the JSON is only usable once complete, so it is not streamed
+            response = self._create_json_completion(**request)
+            response_content = (response.choices[0].message.content or '').strip()
             
-            print("Received response from Azure OpenAI")
-            response_content = response.choices[0].message.content.strip()
-            print(f"Raw Response: {response_content}")
+            logger.debug("Received response from Azure OpenAI")
+            logger.debug("Raw Response: %s", response_content)
             
             if not response_content:
-                print("Empty response received from Azure OpenAI")
+                logger.debug("Empty response received from Azure OpenAI")
                 raise ValueError("Empty response from Azure OpenAI")
             
-            # Try to parse the response
-            try:
-                # First try direct JSON parsing
-                analysis = json.loads(response_content)
-                print("Successfully parsed JSON response")
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON response: {str(e)}")
-                print("Attempting to clean and parse response...")
-                
-                # Try to extract JSON from the response if it's wrapped in markdown or other text
-                # Look for JSON object in the response
-                json_match = re.search(r'\{[\s\S]*\}', response_content)
-                if json_match:
-                    try:
-                        json_str = json_match.group()
-                        # Clean up any potential markdown formatting
-                        json_str = re.sub(r'```json\s*|\s*```', '', json_str)
-                        analysis = json.loads(json_str)
-                        print("Successfully extracted and parsed JSON from response")
-                    except json.JSONDecodeError as e2:
-                        print(f"Failed to parse extracted JSON: {str(e2)}")
-                        raise
-                else:
-                    print("No JSON object found in response")
-                    raise
+            # response_format guarantees a JSON object, so a decode error is a real failure
+            analysis = json.loads(response_content)
+            logger.debug("Successfully parsed JSON response")
             
             # Validate the required structure
             required_keys = ["required_skills", "required_experience", "required_education", 
@@ -192,7 +289,7 @@ class HireAIDemo:
             missing_keys = [key for key in required_keys if key not in analysis]
             
             if missing_keys:
-                print(f"Missing required keys in response: {missing_keys}")
+                logger.debug("Missing required keys in response: %s", missing_keys)
                 # Add missing keys with default values
                 for key in missing_keys:
                     if key == "required_skills":
@@ -206,14 +303,16 @@ class HireAIDemo:
                     else:
                         analysis[key] = []
             
-            print("=== Completed Job Requirements Analysis ===\n")
+            self._cache_analysis(cache_key, analysis)
+            logger.debug("=== Completed Job Requirements Analysis ===")
             return analysis
             
+        except TruncatedResponseError:
+            # Cut-off requirements must not pass for a job without any
+            raise
         except Exception as e:
-            print(f"\nError analyzing job requirements: {str(e)}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            # Tracebacks are only formatted when debug logging is enabled
+            logger.error("Error analyzing job requirements: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             
             # Return a default structure
             return {
@@ -232,90 +331,150 @@ class HireAIDemo:
                 "preferred_qualifications": []
             }
 
-    def analyze_candidate_match(self, job_requirements: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze how well a candidate matches the job requirements using Azure OpenAI"""
+    @staticmethod
+    def _jd_cache_key(job_description: str) -> str:
+        """Hash of the deployment and the job description, ignoring case and whitespace"""
+        normalized = ' '.join(job_description.split()).lower()
+        return hashlib.sha256(f"{AZURE_DEPLOYMENT}|{normalized}".encode("utf-8")).hexdigest()
+
+    def _get_cached_analysis(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached analysis from memory or disk, if present"""
+        with self._jd_lock:
+            analysis = self._jd_cache.get(cache_key)
+            if analysis is not None:
+                self._jd_cache.move_to_end(cache_key)
+            elif self._jd_db is not None:
+                row = self._jd_db.execute(
+                    "SELECT analysis FROM jd_analyses WHERE key = ?", (cache_key,)
+                ).fetchone()
+                if row:
+                    analysis = json.loads(row[0])
+                    self._remember_analysis(cache_key, analysis)
+        # Callers may modify the analysis, so never hand out the cached object
+        return copy.deepcopy(analysis) if analysis is not None else None
+
+    def _cache_analysis(self, cache_key: str, analysis: Dict[str, Any]) -> None:
+        """Store an analysis in memory and, when configured, on disk"""
+        with self._jd_lock:
+            self._remember_analysis(cache_key, copy.deepcopy(analysis))
+            if self._jd_db is not None:
+                with self._jd_db:
+                    self._jd_db.execute(
+                        "INSERT OR REPLACE INTO jd_analyses (key, analysis) VALUES (?, ?)",
+                        (cache_key, json.dumps(analysis))
+                    )
+
+    def _remember_analysis(self, cache_key: str, analysis: Dict[str, Any]) -> None:
+        self._jd_cache[cache_key] = analysis
+        self._jd_cache.move_to_end(cache_key)
+        if len(self._jd_cache) > JD_CACHE_SIZE:
+            self._jd_cache.popitem(last=False)
+
+    @staticmethod
+    def _requirements_json(job_requirements: Dict[str, Any]) -> str:
+        """Canonical JSON of the structured job requirements, built once per search"""
+        return json.dumps(job_requirements, sort_keys=True, default=str)
+
+    @staticmethod
+    def _match_cache_key(job_requirements_json: str, candidate_dict: Dict[str, Any]) -> tuple:
+        """Hashes of the candidate's skills and education and of the structured job requirements"""
+        candidate_content = (json.dumps(sorted(candidate_dict.get('skills') or []))
+                             + json.dumps(candidate_dict.get('education') or [], sort_keys=True, default=str))
+        return (hashlib.sha256(candidate_content.encode("utf-8")).hexdigest(),
+                hashlib.sha256(job_requirements_json.encode("utf-8")).hexdigest())
+
+    @staticmethod
+    def _match_request(job_requirements_json: str, candidate_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request that scores a candidate against job requirements"""
+        # Create a prompt for OpenAI; the instructions and schema are in the system message
+        prompt = f"""Candidate Profile:
+- Name: {candidate_dict.get('name', 'N/A')}
+- Skills: {', '.join(candidate_dict.get('skills', []))}
+- Education: {json.dumps(candidate_dict.get('education', []))}
+
+Job Requirements:
+{job_requirements_json}"""
+        
+        return {
+            "model": AZURE_DEPLOYMENT,
+            "messages": [
+                {"role": "system", "content": MATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": MATCH_MAX_TOKENS,
+            "response_format": {"type": "json_object"}
+        }
+
+    @staticmethod
+    def _parse_match_analysis(content: str) -> Dict[str, Any]:
+        """Parse a candidate match response, scaling overall_score to 0-1"""
+        match_analysis = json.loads(content)
+        
+        # Convert overall_score to a float between 0 and 1
+        if isinstance(match_analysis.get('overall_score'), int):
+            match_analysis['overall_score'] = match_analysis['overall_score'] / 100.0
+        
+        return match_analysis
+
+    def analyze_candidate_match(self, job_requirements: Dict[str, Any], candidate: Dict[str, Any],
+                                job_requirements_json: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyze how well a candidate matches the job requirements using Azure OpenAI
+
+        Args:
+            job_requirements (Dict[str, Any]): Structured job requirements
+            candidate (Dict[str, Any]): Candidate to analyze
+            job_requirements_json (Optional[str]): Serialized requirements, shared across
+                the candidates of one search; built from job_requirements when omitted
+
+        Returns:
+            Dict[str, Any]: Match analysis with overall_score between 0 and 1
+        """
         try:
-            print("\n=== Starting Candidate Analysis ===")
-            print(f"Candidate type: {type(candidate)}")
-            print(f"Candidate attributes: {dir(candidate)}")
-            print(f"Candidate dict: {candidate.__dict__ if hasattr(candidate, '__dict__') else 'No __dict__'}")
-            
-            # Convert candidate object to dictionary if it's not already
-            if hasattr(candidate, 'dict'):
-                print("Converting Pydantic model to dictionary")
-                candidate_dict = candidate.dict()
-            elif hasattr(candidate, '__dict__'):
-                print("Converting object to dictionary using __dict__")
-                candidate_dict = candidate.__dict__
-            else:
-                print("Using candidate as is")
-                candidate_dict = candidate
-                
-            print(f"Converted candidate type: {type(candidate_dict)}")
-            print(f"Converted candidate content: {candidate_dict}")
-            
-            # Create a prompt for OpenAI
-            prompt = f"""
-            Compare the following candidate profile with job requirements:
-            Give more score if 30 to 50 % of skills matches
-            
-            Candidate Profile:
-            - Name: {candidate_dict.get('name', 'N/A')}
-            - Skills: {', '.join(candidate_dict.get('skills', []))}
-            - Education: {json.dumps(candidate_dict.get('education', []))}
-            
-            Job Requirements:
-            {json.dumps(job_requirements, indent=2)}
-            
-            Please analyze and provide a JSON response with the following structure:
-            {{
-                "overall_score": <number between 0 and 100>,
-                "skill_matches": {{
-                    "matched_skills": [<list of matched skills>],
-                    "unmatched_skills": [<list of unmatched skills>]
-                }},
-                "education_match": {{
-                    "candidate_education": <candidate's education>,
-                    "required_education": <required education>,
-                    "match": <"High", "Medium", or "Low">
-                }},
-                "missing_requirements": [<list of missing requirements>]
-            }}
-            
-            Note: Ignore experience requirements in the matching process. Focus on skills and education matches.
-            """
-            
-            print("\nSending request to Azure OpenAI...")
+            if job_requirements_json is None:
+                job_requirements_json = self._requirements_json(job_requirements)
+            logger.debug("=== Starting Candidate Analysis ===")
+            logger.debug("Candidate type: %s", type(candidate))
+            
+            candidate_dict = _to_dict(candidate)
+            
+            # Reuse the analysis of the same skills and education against the same requirements
+            cache_key = self._match_cache_key(job_requirements_json, candidate_dict)
+            with self._match_lock:
+                cached = self._match_cache.get(cache_key)
+                if cached is not None:
+                    self._match_cache.move_to_end(cache_key)
+            if cached is not None:
+                logger.debug("Using cached candidate analysis")
+                return copy.deepcopy(cached)
+            
+            logger.debug("Sending request to Azure OpenAI...")
             # Call Azure OpenAI API
-            response = self.azure_client.chat.completions.create(
-                model=AZURE_DEPLOYMENT,
-                messages=[
-                    {"role": "system", "content": "You are a recruitment expert. Analyze candidate-job matches and provide detailed scoring. Always return a JSON object with the exact structure specified."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
+            response = self._create_json_completion(**self._match_request(job_requirements_json, candidate_dict))
             
-            print("Received response from Azure OpenAI")
-            print(f"Raw Response: {response.choices[0].message.content}")
+            logger.debug("Received response from Azure OpenAI")
+            logger.debug("Raw Response: %s", response.choices[0].message.content)
             
             # Parse the response
-            match_analysis = json.loads(response.choices[0].message.content)
+            match_analysis = self._parse_match_analysis(response.choices[0].message.content)
             
-            # Convert overall_score to a float between 0 and 1
-            if isinstance(match_analysis.get('overall_score'), int):
-                match_analysis['overall_score'] = match_analysis['overall_score'] / 100.0
+            with self._match_lock:
+                self._match_cache[cache_key] = copy.deepcopy(match_analysis)
+                if len(self._match_cache) > MATCH_CACHE_SIZE:
+                    self._match_cache.popitem(last=False)
             
-            print("Successfully parsed response")
-            print("=== Completed Candidate Analysis ===\n")
+            logger.debug("Successfully parsed response")
+            logger.debug("=== Completed Candidate Analysis ===")
             
             return match_analysis
             
+        except TruncatedResponseError:
+            # A cut-off analysis must not pass for a score of 0
+            raise
         except Exception as e:
-            print(f"\nError analyzing candidate match: {str(e)}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            # Tracebacks are only formatted when debug logging is enabled
+            logger.error("Error analyzing candidate match: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "overall_score": 0.0,
                 "skill_matches": {
@@ -330,52 +489,317 @@ class HireAIDemo:
                 "missing_requirements": []
             }
 
-    def search_candidates(self, job_description: str) -> Dict[str, Any]:
-        """Search for candidates matching the job description using AI"""
+    def _create_completion(self, **kwargs):
+        """Create a chat completion, retrying rate limits and timeouts with exponential backoff"""
+        for attempt in range(MAX_RETRIES):
+            try:
+                return self.azure_client.chat.completions.create(**kwargs)
+            except (RateLimitError, APITimeoutError, APIConnectionError):
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def _create_json_completion(self, **kwargs):
+        """Create a JSON mode completion, retrying once with twice the token limit if it was cut off"""
+        response = self._create_completion(**kwargs)
+        if response.choices[0].finish_reason == "length":
+            max_tokens = kwargs["max_tokens"] * 2
+            logger.warning("Completion truncated at %s tokens, retrying with %s", kwargs["max_tokens"], max_tokens)
+            response = self._create_completion(**{**kwargs, "max_tokens": max_tokens})
+            if response.choices[0].finish_reason == "length":
+                raise TruncatedResponseError(f"Azure OpenAI response truncated at {max_tokens} tokens")
+        return response
+
+    @staticmethod
+    def _skill_set(skills) -> set:
+        """Lowercased skills from a list or a comma separated string"""
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        return {skill.strip().lower() for skill in skills or [] if isinstance(skill, str) and skill.strip()}
+
+    @staticmethod
+    def _skill_key(skill: str) -> str:
+        """Skill name normalized for matching: lowercase, single spaced and without a plural 's'"""
+        key = " ".join(skill.lower().split())
+        if len(key) > 3 and key.endswith("s") and not key.endswith(("ss", "us", "is")):
+            key = key[:-1]
+        return key
+
+    @classmethod
+    def _skill_lexicon(cls, skills) -> Dict[str, str]:
+        """Normalized skill keys mapped to their first spelling, from a list or a comma separated string"""
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        lexicon = {}
+        for skill in skills or []:
+            if isinstance(skill, str) and skill.strip():
+                lexicon.setdefault(cls._skill_key(skill), skill.strip())
+        return lexicon
+
+    @staticmethod
+    def _skill_matches(required_skills: Dict[str, str], candidate_skills: set) -> Dict[str, List[str]]:
+        """Required skills split by whether the candidate has them, in job description order"""
+        return {
+            "matched_skills": [skill for key, skill in required_skills.items() if key in candidate_skills],
+            "unmatched_skills": [skill for key, skill in required_skills.items() if key not in candidate_skills]
+        }
+
+    @classmethod
+    def _overlap_match_analysis(cls, overlap: float, required_skills: Dict[str, str],
+                                candidate_skills: set) -> Dict[str, Any]:
+        """Match analysis for a candidate accepted on skill overlap alone"""
+        return {
+            "overall_score": overlap,
+            "skill_matches": cls._skill_matches(required_skills, candidate_skills),
+            "education_match": {
+                "candidate_education": "N/A",
+                "required_education": "N/A",
+                "match": "Not analyzed"
+            },
+            "missing_requirements": [],
+            "match_source": "skill_overlap"
+        }
+
+    def _shortlist_by_embedding(self, job_analysis: Dict[str, Any], candidates: List[Dict[str, Any]],
+                                indices: List[int], top_k: int) -> List[int]:
+        """Keep the top_k candidates whose skill embeddings are closest to the required skills"""
+        try:
+            job_info = {"skills": sorted(self._skill_set(job_analysis.get("required_skills")))}
+            # The whole pool is scored so the cached candidate embedding matrix stays the
+            # same across searches; only the indices still in play are then compared
+            candidate_info = [{"skills": sorted(self._skill_set(candidate.get("skills")))} for candidate in candidates]
+            scores = self.embedding_calculator.score_candidates(job_info, candidate_info)[indices]
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            # Keep the original candidate order for the analysis results
+            return [indices[j] for j in sorted(top)]
+        except Exception as e:
+            logger.warning("Embedding shortlist failed (%s), analyzing all candidates", e)
+            return indices
+
+    def _match_candidate(self, job_analysis: Dict[str, Any], candidate: Dict[str, Any], job_analysis_json: str,
+                         skill_matches: Optional[Dict[str, List[str]]] = None):
+        """Analyze one candidate, returning the match only if it meets the threshold"""
+        match_score = self.analyze_candidate_match(job_analysis, candidate, job_analysis_json)
+        if skill_matches is not None:
+            # Skill membership is decided locally; the model's lists are only its reading of it
+            match_score["skill_matches"] = skill_matches
+        if match_score["overall_score"] >= self.match_threshold:
+            return {
+                "candidate": candidate,
+                "match_analysis": match_score
+            }
+        return None
+
+    @staticmethod
+    def _rank_matches(matches: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Matches sorted by overall score, highest first, keeping input order for ties"""
+        # Read each score once and sort on it directly instead of through a lambda
+        scored = [(match["match_analysis"]["overall_score"], match) for match in matches if match is not None]
+        scored.sort(key=itemgetter(0), reverse=True)
+        return [match for _, match in scored]
+
+    def search_candidates(self, job_description: str, max_results: int = MATCH_TOP_K) -> Dict[str, Any]:
+        """
+        Search for candidates matching the job description using AI
+
+        Args:
+            job_description (str): Job description to match candidates against
+            max_results (int): Maximum number of matching candidates to return; at most
+                this many candidates are sent for the detailed AI analysis
+
+        Returns:
+            Dict[str, Any]: Job requirements and the best matching candidates
+        """
         try:
-            print("\n=== Starting Candidate Search ===")
-            print("Starting candidate search...")
+            max_results = max(int(max_results), 1)
+            logger.debug("=== Starting Candidate Search ===")
+            logger.debug("Starting candidate search...")
             
             # Get all candidates from the database
-            candidates = self.supabase_client.get_all_candidates()
+            candidates = self._candidates()
             if not candidates:
-                print("No candidates found in database")
+                logger.debug("No candidates found in database")
                 return {
                     "status": "error",
                     "message": "No candidates found in the database"
                 }
             
-            print(f"Found {len(candidates)} candidates in database")
-            print(f"First candidate type: {type(candidates[0])}")
-            print(f"First candidate content: {candidates[0]}")
+            logger.debug("Found %s candidates in database", len(candidates))
+            logger.debug("First candidate type: %s", type(candidates[0]))
+            logger.debug("First candidate content: %s", candidates[0])
             
             # Analyze job requirements using Azure OpenAI
             job_analysis = self.analyze_job_requirements(job_description)
             if not job_analysis:
-                print("Failed to analyze job requirements")
+                logger.debug("Failed to analyze job requirements")
                 return {
                     "status": "error",
                     "message": "Failed to analyze job requirements"
                 }
             
-            print("Analyzing candidates...")
-            matching_candidates = []
+            logger.debug("Analyzing candidates...")
+            matches = [None] * len(candidates)
             
-            # Analyze each candidate against job requirements
+            # Settle clear cases locally by skill overlap and only send the rest to the model
+            required_skills = self._skill_lexicon(job_analysis.get("required_skills"))
+            skill_matches = [None] * len(candidates)
+            to_analyze = []
+            filtered_count = 0
             for i, candidate in enumerate(candidates):
-                print(f"\nProcessing candidate {i+1}/{len(candidates)}")
-                match_score = self.analyze_candidate_match(job_analysis, candidate)
-                if match_score["overall_score"] >= 0.5:  # 50% match threshold
-                    matching_candidates.append({
-                        "candidate": candidate,
+                if required_skills:
+                    candidate_skills = set(self._skill_lexicon(candidate.get("skills")))
+                    overlap = len(required_skills.keys() & candidate_skills) / len(required_skills)
+                    if overlap < PREFILTER_MIN_OVERLAP:
+                        filtered_count += 1
+                        continue
+                    if overlap >= PREFILTER_AUTO_MATCH:
+                        matches[i] = {
+                            "candidate": candidate,
+                            "match_analysis": self._overlap_match_analysis(overlap, required_skills, candidate_skills)
+                        }
+                        continue
+                    skill_matches[i] = self._skill_matches(required_skills, candidate_skills)
+                to_analyze.append(i)
+            if len(to_analyze) > max_results and required_skills:
+                to_analyze = self._shortlist_by_embedding(job_analysis, candidates, to_analyze, max_results)
+            logger.debug("Filtered out %s candidates by skill overlap, %s sent for AI analysis",
+                         filtered_count, len(to_analyze))
+            
+            # Serialize the requirements once for every prompt and cache key of this search
+            job_analysis_json = self._requirements_json(job_analysis)
+            
+            # Analyze candidates against job requirements concurrently; each call is
+            # an independent network-bound request
+            with ThreadPoolExecutor(max_workers=MATCH_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._match_candidate, job_analysis, candidates[i], job_analysis_json,
+                                    skill_matches[i]): i
+                    for i in to_analyze
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    try:
+                        matches[i] = future.result()
+                    except TruncatedResponseError as e:
+                        # One cut-off analysis only drops its candidate, as in the batch search
+                        logger.warning("Match analysis for candidate %s was truncated, skipping it: %s",
+                                       _to_dict(candidates[i]).get("id", i), e)
+                    logger.debug("Processed candidate %s/%s", done, len(to_analyze))
+            
+            # Sort candidates by match score and keep the best max_results
+            matching_candidates = self._rank_matches(matches)[:max_results]
+            
+            logger.debug("Found %s matching candidates", len(matching_candidates))
+            logger.debug("=== Completed Candidate Search ===")
+            
+            return {
+                "status": "success",
+                "job_requirements": job_analysis,
+                "matching_candidates": matching_candidates,
+                "total_candidates": len(candidates),
+                "matching_count": len(matching_candidates),
+                "filtered_count": filtered_count
+            }
+            
+        except Exception as e:
+            # Tracebacks are only formatted when debug logging is enabled
+            logger.error("Error in candidate search: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {
+                "status": "error",
+                "message": f"Error searching candidates: {str(e)}"
+            }
+
+    def search_candidates_batch(self, job_description: str) -> Dict[str, Any]:
+        """
+        Score the whole candidate pool through the Azure OpenAI Batch API
+
+        Meant for offline rescoring, e.g. when a new job is posted; results can take
+        up to 24 hours. Interactive searches should use search_candidates.
+
+        Args:
+            job_description (str): Job description to match candidates against
+
+        Returns:
+            Dict[str, Any]: Same structure as search_candidates
+        """
+        try:
+            logger.debug("=== Starting Batch Candidate Search ===")
+            candidates = self._candidates()
+            if not candidates:
+                return {
+                    "status": "error",
+                    "message": "No candidates found in the database"
+                }
+            
+            job_analysis = self.analyze_job_requirements(job_description)
+            job_analysis_json = self._requirements_json(job_analysis)
+            required_skills = self._skill_lexicon(job_analysis.get("required_skills"))
+            
+            # One request per candidate, identified by its position in the pool
+            lines = [
+                json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/chat/completions",
+                    "body": self._match_request(job_analysis_json, candidate)
+                })
+                for i, candidate in enumerate(candidates)
+            ]
+            batch_file = self.azure_client.files.create(
+                file=("candidate_matches.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.azure_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/chat/completions",
+                completion_window="24h"
+            )
+            logger.info("Created batch %s for %s candidates", batch.id, len(candidates))
+            
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(BATCH_POLL_INTERVAL)
+                batch = self.azure_client.batches.retrieve(batch.id)
+                logger.info("Batch %s status: %s", batch.id, batch.status)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                return {
+                    "status": "error",
+                    "message": f"Batch {batch.id} ended with status {batch.status}"
+                }
+            
+            # Map each output line back to its candidate; failed requests are skipped
+            matches = [None] * len(candidates)
+            output = self.azure_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                try:
+                    choice = response["body"]["choices"][0]
+                    if choice.get("finish_reason") == "length":
+                        logger.warning("Batch result for candidate %s was truncated, skipping it", result["custom_id"])
+                        continue
+                    match_score = self._parse_match_analysis(choice["message"]["content"])
+                except (KeyError, IndexError, json.JSONDecodeError):
+                    continue
+                if match_score.get("overall_score", 0) >= self.match_threshold:
+                    i = int(result["custom_id"])
+                    if required_skills:
+                        match_score["skill_matches"] = self._skill_matches(
+                            required_skills, set(self._skill_lexicon(candidates[i].get("skills")))
+                        )
+                    matches[i] = {
+                        "candidate": candidates[i],
                         "match_analysis": match_score
-                    })
+                    }
             
-            # Sort candidates by match score
-            matching_candidates.sort(key=lambda x: x["match_analysis"]["overall_score"], reverse=True)
+            matching_candidates = self._rank_matches(matches)
             
-            print(f"\nFound {len(matching_candidates)} matching candidates")
-            print("=== Completed Candidate Search ===\n")
+            logger.debug("Found %s matching candidates", len(matching_candidates))
+            logger.debug("=== Completed Batch Candidate Search ===")
             
             return {
                 "status": "success",
@@ -386,25 +810,21 @@ class HireAIDemo:
             }
             
         except Exception as e:
-            print(f"\nError in candidate search: {str(e)}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error("Error in batch candidate search: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "status": "error",
                 "message": f"Error searching candidates: {str(e)}"
             }
 
-    def generate_skills_chart(self) -> str:
+    def generate_skills_chart(self) -> Any:
         """Generate a chart of most common skills"""
         try:
-            candidates = self.supabase_client.get_all_candidates()
-            all_skills = []
-            for candidate in candidates:
-                all_skills.extend(candidate.get('skills', []))
+            # Count skills as they are read instead of collecting them into one list
+            skill_counts = Counter()
+            for candidate in self._candidates():
+                skill_counts.update(candidate.get('skills') or ())
             
-            chart_path = self.skill_visualizer.plot_skill_frequency(all_skills)
-            return chart_path
+            return self.skill_visualizer.plot_skill_frequency(skill_counts)
         except Exception as e:
             return f"Error generating chart: {str(e)}"
 
@@ -511,6 +931,13 @@ The ideal candidate should have experience with:
 - CI/CD pipelines""",
                             lines=10
                         )
+                        max_results = gr.Slider(
+                            minimum=1,
+                            maximum=100,
+                            value=MATCH_TOP_K,
+                            step=1,
+                            label="Maximum Results"
+                        )
                         search_btn = gr.Button("Search Candidates", variant="primary")
                     
                     with gr.Column():
@@ -526,83 +953,32 @@ The ideal candidate should have experience with:
                                 search_output = gr.JSON(label="Matching Candidates")
                 
                 def format_candidate_grid(search_results):
-                    print("\n=== Starting Grid Formatting ===")
-                    print(f"Search results status: {search_results.get('status')}")
+                    logger.debug("=== Starting Grid Formatting ===")
+                    logger.debug("Search results status: %s", search_results.get('status'))
                     
                     if search_results["status"] != "success":
-                        print("Search results status is not success")
+                        logger.debug("Search results status is not success")
                         return [], search_results
                     
-                    print(f"Number of matching candidates: {len(search_results.get('matching_candidates', []))}")
+                    logger.debug("Number of matching candidates: %s", len(search_results.get('matching_candidates', [])))
                     grid_data = []
                     
                     for idx, match in enumerate(search_results["matching_candidates"]):
-                        print(f"\nProcessing candidate {idx + 1}")
+                        logger.debug("Processing candidate %s", idx + 1)
                         candidate = match["candidate"]
                         analysis = match["match_analysis"]
                         
-                        print(f"Raw candidate type: {type(candidate)}")
-                        print(f"Raw candidate data: {candidate}")
-                        
-                        # Convert candidate to dict if it's a string or Pydantic model
-                        if isinstance(candidate, str):
-                            # Try to extract data from Pydantic model string representation
-                            try:
-                                # Extract name
-                                name_match = re.search(r"name='([^']*)'", candidate)
-                                name = name_match.group(1) if name_match else "N/A"
-                                
-                                # Extract email
-                                email_match = re.search(r"email='([^']*)'", candidate)
-                                email = email_match.group(1) if email_match else "N/A"
-                                
-                                # Extract skills
-                                skills_match = re.search(r"skills=\[(.*?)\]", candidate)
-                                skills = []
-                                if skills_match:
-                                    skills_str = skills_match.group(1)
-                                    skills = [s.strip("' ") for s in skills_str.split(',') if s.strip()]
-                                
-                                # Extract experience
-                                exp_match = re.search(r"experience=\[(.*?)\]", candidate)
-                                experience = "No experience listed"
-                                if exp_match:
-                                    exp_str = exp_match.group(1)
-                                    title_match = re.search(r"title='([^']*)'", exp_str)
-                                    company_match = re.search(r"company='([^']*)'", exp_str)
-                                    if title_match and company_match:
-                                        experience = f"{title_match.group(1)} at {company_match.group(1)}"
-                                
-                                # Create a dictionary with the extracted data
-                                candidate = {
-                                    "name": name,
-                                    "email": email,
-                                    "skills": skills,
-                                    "experience": [{"title": title_match.group(1) if title_match else "N/A",
-                                                  "company": company_match.group(1) if company_match else "N/A"}]
-                                }
-                                print("Successfully extracted data from string representation")
-                            except Exception as e:
-                                print(f"Warning: Could not parse candidate string: {str(e)}")
-                                continue
-                        elif hasattr(candidate, 'dict'):
-                            candidate = candidate.dict()
-                            print("Converted Pydantic model to dictionary")
-                        elif hasattr(candidate, '__dict__'):
-                            candidate = candidate.__dict__
-                            print("Converted object to dictionary using __dict__")
-                        
-                        print(f"Processed candidate type: {type(candidate)}")
-                        print(f"Processed candidate data: {candidate}")
+                        # Candidates come from the database as plain dictionaries
+                        logger.debug("Candidate data: %s", candidate)
                         
                         # Format skills for display
                         skills = []
                         if isinstance(candidate.get("skills"), list):
                             skills = candidate["skills"][:5]
-                            print(f"Found skills list: {skills}")
+                            logger.debug("Found skills list: %s", skills)
                         elif isinstance(candidate.get("skills"), str):
                             skills = candidate["skills"].split(",")[:5]
-                            print(f"Found skills string, split into: {skills}")
+                            logger.debug("Found skills string, split into: %s", skills)
                         
                         skills_display = ", ".join(skills)
                         if len(skills) > 5:
@@ -615,15 +991,12 @@ The ideal candidate should have experience with:
                                 exp = candidate["experience"][0]
                                 if isinstance(exp, dict):
                                     experience = f"{exp.get('title', 'N/A')} at {exp.get('company', 'N/A')}"
-                                elif hasattr(exp, 'dict'):
-                                    exp_dict = exp.dict()
-                                    experience = f"{exp_dict.get('title', 'N/A')} at {exp_dict.get('company', 'N/A')}"
                         
                         # Get name and email
                         name = candidate.get("name", "N/A")
                         email = candidate.get("email", "N/A")
                         
-                        print(f"Formatted row: [{name}, {email}, {skills_display}, {experience}]")
+                        logger.debug("Formatted row: [%s, %s, %s, %s]", name, email, skills_display, experience)
                         grid_data.append([
                             name,
                             email,
@@ -631,14 +1004,20 @@ The ideal candidate should have experience with:
                             experience
                         ])
                     
-                    print(f"\nFinal grid data length: {len(grid_data)}")
-                    print("=== Completed Grid Formatting ===\n")
+                    logger.debug("Final grid data length: %s", len(grid_data))
+                    logger.debug("=== Completed Grid Formatting ===")
                     return grid_data, search_results
                 
+                def search_with_progress(job_description, max_results):
+                    # Show a status while the search runs; its results arrive in one piece
+                    yield {"status": "in_progress", "message": "Analyzing job requirements and scoring candidates..."}
+                    yield demo.search_candidates(job_description, max_results)
+                
                 search_btn.click(
-                    demo.search_candidates,
-                    inputs=[job_description],
-                    outputs=[search_output]
+                    search_with_progress,
+                    inputs=[job_description, max_results],
+                    outputs=[search_output],
+                    queue=True
                 ).then(
                     format_candidate_grid,
                     inputs=[search_output],
@@ -648,5 +1027,6 @@ The ideal candidate should have experience with:
     return interface
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     interface = create_demo_interface()
     interface.launch(share=True) 
@@ -1,15 +1,243 @@
+import os
+import gzip
+import time
+import heapq
+import inspect
+import threading
+from functools import wraps
+from operator import itemgetter
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from typing import List, Dict, Any
-from collections import Counter
+from typing import List, Dict, Any, Tuple
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from scipy.sparse import csr_matrix
 from hireai.database.supabase_client import SupabaseClient
 
+# Seconds a fetched candidate list or built chart is reused before it is rebuilt
+CANDIDATE_CACHE_TTL = float(os.getenv("HIREAI_CHART_CACHE_TTL", "60"))
+
+# Number of built charts kept, keyed by chart and parameters
+FIGURE_CACHE_SIZE = 32
+
+# numpy datetime64 unit each trend period is truncated to; weeks start on Monday
+TIME_PERIOD_UNITS = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+
+# Candidate tables at least this large have their skills interned across CPU cores
+PARALLEL_INTERN_MIN = int(os.getenv("HIREAI_PARALLEL_INTERN_MIN", "100000"))
+
+# Candidate columns the charts read
+CANDIDATE_COLUMNS = 'skills, created_at'
+
+def _intern_skill_lists(skill_lists: List[List[str]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Intern one batch of skill lists; see _intern_skills"""
+    vocab: Dict[str, int] = {}
+    spelling_ids: Dict[str, int] = {}
+    skill_ids = []
+    lengths = []
+    for skills in skill_lists:
+        for skill in skills:
+            idx = spelling_ids.get(skill)
+            if idx is None:
+                idx = spelling_ids[skill] = vocab.setdefault(skill.lower(), len(vocab))
+            skill_ids.append(idx)
+        lengths.append(len(skills))
+    return list(vocab), np.array(skill_ids, dtype=np.int32), np.array(lengths, dtype=np.int64)
+
+def _intern_skills(skill_lists: List[List[str]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Map candidate skills to integer ids, lowercasing each distinct spelling only once
+    
+    Args:
+        skill_lists (List[List[str]]): Skills of each candidate
+        
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: Lowercased skills in order of first
+            occurrence, the skill ids of all candidates concatenated, and the number
+            of skills of each candidate
+    """
+    n_jobs = os.cpu_count() or 1
+    if len(skill_lists) < PARALLEL_INTERN_MIN or n_jobs == 1:
+        return _intern_skill_lists(skill_lists)
+    
+    # Intern contiguous chunks in worker processes, then remap each chunk's local ids.
+    # Merging the vocabularies in chunk order keeps skills in order of first occurrence.
+    chunk_size = -(-len(skill_lists) // n_jobs)
+    parts = Parallel(n_jobs=n_jobs)(
+        delayed(_intern_skill_lists)(skill_lists[start:start + chunk_size])
+        for start in range(0, len(skill_lists), chunk_size)
+    )
+    vocab: Dict[str, int] = {}
+    skill_ids = []
+    for part_vocab, part_ids, _ in parts:
+        global_ids = np.array([vocab.setdefault(skill, len(vocab)) for skill in part_vocab], dtype=np.int32)
+        skill_ids.append(global_ids[part_ids])
+    return list(vocab), np.concatenate(skill_ids), np.concatenate([lengths for _, _, lengths in parts])
+
+def _write_html(fig: go.Figure, output_file: str) -> None:
+    """Save a chart as HTML that loads plotly.js from its CDN, gzipped if the path ends in .gz"""
+    # Embedding plotly.js would add about 3MB to every file
+    if output_file.endswith('.gz'):
+        with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+            fig.write_html(f, include_plotlyjs='cdn', full_html=True)
+    else:
+        fig.write_html(output_file, include_plotlyjs='cdn', full_html=True)
+
+def _cached_figure(method):
+    """Reuse the figure built for the same parameters until invalidate() or the TTL expires"""
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        output_file = bound.arguments.pop('output_file', None)
+        key = (method.__name__,) + tuple(value for name, value in bound.arguments.items() if name != 'self')
+        
+        with self._figures_lock:
+            entry = self._figures.get(key)
+            if entry is not None and time.monotonic() - entry[1] < CANDIDATE_CACHE_TTL:
+                self._figures.move_to_end(key)
+                fig = entry[0]
+            else:
+                fig = None
+        if fig is not None:
+            if output_file:
+                _write_html(fig, output_file)
+            return fig
+        
+        fig = method(self, *args, **kwargs)
+        with self._figures_lock:
+            self._figures[key] = (fig, time.monotonic())
+            if len(self._figures) > FIGURE_CACHE_SIZE:
+                self._figures.popitem(last=False)
+        return fig
+
+    return wrapper
+
+class CandidateSkills:
+    """Candidate skills and creation times laid out as flat arrays rather than one dict per candidate"""
+
+    def __init__(self, vocab: List[str], skill_ids: np.ndarray, lengths: np.ndarray, created_at: np.ndarray):
+        self.vocab = vocab
+        self.skill_ids = skill_ids
+        self.lengths = lengths
+        self.created_at = created_at
+        # Occurrences of each skill id
+        self.counts = np.bincount(skill_ids, minlength=len(vocab))
+        # Candidate position of each entry in skill_ids
+        self.rows = np.repeat(np.arange(len(lengths)), lengths)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @classmethod
+    def from_candidates(cls, candidates: List[Dict[str, Any]]) -> "CandidateSkills":
+        """
+        Intern the skills and parse the creation times of fetched candidate rows
+        
+        Args:
+            candidates (List[Dict[str, Any]]): Rows from SupabaseClient.get_all_candidates,
+                whose skills are always lists
+            
+        Returns:
+            CandidateSkills: Arrays for the candidates in the given order
+        """
+        vocab, skill_ids, lengths = _intern_skills([candidate['skills'] for candidate in candidates])
+        created_at = pd.to_datetime(
+            pd.Series([candidate.get('created_at') for candidate in candidates], dtype=object),
+            utc=True, format='ISO8601', cache=True
+        ).dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+        return cls(vocab, skill_ids, lengths, created_at)
+
+
 class SkillVisualizer:
-    def __init__(self):
-        """Initialize the skill visualizer with Supabase client"""
+    def __init__(self, use_db_aggregates: bool = True):
+        """
+        Initialize the skill visualizer with Supabase client
+
+        Args:
+            use_db_aggregates (bool): Count skills and skill pairs in Postgres with the
+                functions from migration 003 instead of fetching every candidate
+        """
         self.db_client = SupabaseClient()
+        self.use_db_aggregates = use_db_aggregates
+        self._candidates = None
+        self._candidates_fetched_at = 0.0
+        self._candidates_lock = threading.Lock()
+        # Built figures are shared between callers, which should not modify them
+        self._figures: "OrderedDict[tuple, Tuple[go.Figure, float]]" = OrderedDict()
+        self._figures_lock = threading.Lock()
+
+    def _get_candidates(self) -> CandidateSkills:
+        """Skills and creation times of all candidates, reusing the last fetch for CANDIDATE_CACHE_TTL seconds"""
+        with self._candidates_lock:
+            now = time.monotonic()
+            if self._candidates is None or now - self._candidates_fetched_at >= CANDIDATE_CACHE_TTL:
+                # Interned once per fetch, so every chart works on the same arrays
+                self._candidates = CandidateSkills.from_candidates(
+                    self.db_client.get_all_candidates(CANDIDATE_COLUMNS)
+                )
+                self._candidates_fetched_at = now
+            return self._candidates
+
+    def invalidate(self) -> None:
+        """Drop cached candidates and charts, e.g. after a candidate is added"""
+        with self._candidates_lock:
+            self._candidates = None
+        with self._figures_lock:
+            self._figures.clear()
+
+    @staticmethod
+    def _period_starts(timestamps: np.ndarray, time_period: str) -> np.ndarray:
+        """
+        Start of the day, week, month or year containing each timestamp
+        
+        Args:
+            timestamps (np.ndarray): datetime64[ns] timestamps in UTC
+            time_period (str): 'day', 'week', 'month', or 'year'
+            
+        Returns:
+            np.ndarray: datetime64[ns] period starts in UTC
+        """
+        if time_period not in TIME_PERIOD_UNITS:
+            raise ValueError(f"Unsupported time period: {time_period}")
+        
+        if time_period == 'week':
+            days = timestamps.astype('datetime64[D]')
+            # The epoch fell on a Thursday, so this steps each day back to its Monday
+            starts = days - (days.astype(np.int64) + 3) % 7
+        else:
+            # Truncating to a coarser unit floors the whole array in one vectorized cast
+            starts = timestamps.astype(f'datetime64[{TIME_PERIOD_UNITS[time_period]}]')
+        return starts.astype('datetime64[ns]')
+
+    @staticmethod
+    def _top_skill_ids(counts: np.ndarray, top_n: int, min_frequency: int = 1) -> np.ndarray:
+        """Ids of the top_n most common skills occurring at least min_frequency times, most common first"""
+        # A stable sort keeps equally common skills in order of first occurrence
+        top_ids = np.argsort(-counts, kind='stable')[:top_n]
+        return top_ids[counts[top_ids] >= min_frequency]
 
+    @staticmethod
+    def _co_occurrence(candidates: CandidateSkills, top_ids: np.ndarray) -> np.ndarray:
+        """Number of times each pair of the given skill ids occurs on the same candidate"""
+        # Build a sparse candidate x skill occurrence matrix over the given skills
+        columns = np.full(len(candidates.vocab), -1, dtype=np.int64)
+        columns[top_ids] = np.arange(len(top_ids))
+        cols = columns[candidates.skill_ids]
+        keep = cols >= 0
+        occurrence = csr_matrix(
+            (np.ones(int(keep.sum()), dtype=np.int32), (candidates.rows[keep], cols[keep])),
+            shape=(len(candidates), len(top_ids))
+        )
+        
+        # Co-occurrence counts in one sparse product instead of a loop over skill pairs
+        return (occurrence.T @ occurrence).toarray()
+
+    @_cached_figure
     def generate_skill_distribution(self, 
                                   top_n: int = 20, 
                                   min_frequency: int = 2,
@@ -20,37 +248,49 @@ class SkillVisualizer:
         Args:
             top_n (int): Number of top skills to display
             min_frequency (int): Minimum frequency to include a skill
-            output_file (str): Optional path to save the chart as HTML
+            output_file (str): Optional path to save the chart as HTML, gzipped if it ends in .gz
             
         Returns:
             go.Figure: Plotly figure object
         """
-        # Fetch all candidates
-        candidates = self.db_client.get_all_candidates()
-        
-        # Extract and count skills
-        all_skills = []
-        for candidate in candidates:
-            skills = candidate.get('skills', [])
-            if isinstance(skills, list):
-                all_skills.extend([skill.lower() for skill in skills])
+        if self.use_db_aggregates:
+            # Only the top skills leave the database
+            skill_counts = self.db_client.get_skill_counts(top_n, min_frequency)
+        else:
+            # Skill frequencies are counted once per fetch with a bincount over the skill ids
+            candidates = self._get_candidates()
+            skill_counts = {
+                candidates.vocab[i]: int(candidates.counts[i])
+                for i in self._top_skill_ids(candidates.counts, top_n, min_frequency)
+            }
         
-        # Count skill frequencies
-        skill_counter = Counter(all_skills)
-        
-        # Filter by minimum frequency
-        filtered_skills = {k: v for k, v in skill_counter.items() if v >= min_frequency}
+        return self.plot_skill_frequency(skill_counts, top_n, min_frequency, output_file)
+
+    def plot_skill_frequency(self,
+                             skill_counts: Dict[str, int],
+                             top_n: int = 20,
+                             min_frequency: int = 1,
+                             output_file: str = None) -> go.Figure:
+        """
+        Generate a bar chart of the most common skills from precomputed counts
         
-        # Get top N skills
-        top_skills = dict(sorted(filtered_skills.items(), 
-                               key=lambda x: x[1], 
-                               reverse=True)[:top_n])
+        Args:
+            skill_counts (Dict[str, int]): Number of candidates per skill, e.g. a Counter
+            top_n (int): Number of top skills to display
+            min_frequency (int): Minimum frequency to include a skill
+            output_file (str): Optional path to save the chart as HTML, gzipped if it ends in .gz
+            
+        Returns:
+            go.Figure: Plotly figure object
+        """
+        # Get top N skills with a heap, as Counter.most_common does, then drop the rare ones
+        top_skills = {
+            skill: count for skill, count in heapq.nlargest(top_n, skill_counts.items(), key=itemgetter(1))
+            if count >= min_frequency
+        }
         
-        # Create DataFrame for easier manipulation
-        df = pd.DataFrame({
-            'Skill': list(top_skills.keys()),
-            'Count': list(top_skills.values())
-        })
+        skill_names = list(top_skills.keys())
+        counts = list(top_skills.values())
         
         # Create figure
         fig = go.Figure()
@@ -58,9 +298,9 @@ class SkillVisualizer:
         # Add bar chart
         fig.add_trace(
             go.Bar(
-                x=df['Skill'],
-                y=df['Count'],
-                text=df['Count'],
+                x=skill_names,
+                y=counts,
+                text=counts,
                 textposition='auto',
                 marker_color='rgb(55, 83, 109)',
                 hovertemplate="<b>%{x}</b><br>" +
@@ -89,10 +329,11 @@ class SkillVisualizer:
         
         # Save to file if path provided
         if output_file:
-            fig.write_html(output_file)
+            _write_html(fig, output_file)
             
         return fig
 
+    @_cached_figure
     def generate_skill_heatmap(self, 
                              top_n: int = 20,
                              min_frequency: int = 2,
@@ -103,52 +344,37 @@ class SkillVisualizer:
         Args:
             top_n (int): Number of top skills to include
             min_frequency (int): Minimum frequency to include a skill
-            output_file (str): Optional path to save the chart as HTML
+            output_file (str): Optional path to save the chart as HTML, gzipped if it ends in .gz
             
         Returns:
             go.Figure: Plotly figure object
         """
-        # Fetch all candidates
-        candidates = self.db_client.get_all_candidates()
-        
-        # Extract and count skills
-        all_skills = []
-        for candidate in candidates:
-            skills = candidate.get('skills', [])
-            if isinstance(skills, list):
-                all_skills.extend([skill.lower() for skill in skills])
-        
-        # Count skill frequencies
-        skill_counter = Counter(all_skills)
-        
-        # Filter by minimum frequency
-        filtered_skills = {k: v for k, v in skill_counter.items() if v >= min_frequency}
-        
-        # Get top N skills
-        top_skills = dict(sorted(filtered_skills.items(), 
-                               key=lambda x: x[1], 
-                               reverse=True)[:top_n])
-        
-        # Create co-occurrence matrix
-        co_occurrence = pd.DataFrame(0, 
-                                   index=top_skills.keys(), 
-                                   columns=top_skills.keys())
-        
-        # Fill co-occurrence matrix
-        for candidate in candidates:
-            skills = candidate.get('skills', [])
-            if isinstance(skills, list):
-                skills = [skill.lower() for skill in skills]
-                for skill1 in skills:
-                    for skill2 in skills:
-                        if skill1 in co_occurrence.index and skill2 in co_occurrence.columns:
-                            co_occurrence.loc[skill1, skill2] += 1
+        if self.use_db_aggregates:
+            # Top skills and their pair counts are aggregated in the database, so at
+            # most top_n + top_n² rows are transferred
+            skill_names = list(self.db_client.get_skill_counts(top_n, min_frequency))
+            skill_to_idx = {skill: i for i, skill in enumerate(skill_names)}
+            co_occurrence = np.zeros((len(skill_names), len(skill_names)), dtype=np.int64)
+            # Each unordered pair arrives once; mirror it into both halves of the matrix
+            for (skill1, skill2), count in self.db_client.get_skill_pair_counts(skill_names).items():
+                i, j = skill_to_idx[skill1], skill_to_idx[skill2]
+                co_occurrence[i, j] = co_occurrence[j, i] = count
+        else:
+            # Fetch all candidates and get top N skills
+            candidates = self._get_candidates()
+            top_ids = self._top_skill_ids(candidates.counts, top_n, min_frequency)
+            skill_names = [candidates.vocab[i] for i in top_ids]
+            co_occurrence = self._co_occurrence(candidates, top_ids)
         
         # Create heatmap
+        # z stays a numpy array so Plotly serializes it as a typed array, and the fixed
+        # color range spares the browser a scan of every cell
         fig = go.Figure(data=go.Heatmap(
-            z=co_occurrence.values,
-            x=co_occurrence.columns,
-            y=co_occurrence.index,
+            z=co_occurrence,
+            x=skill_names,
+            y=skill_names,
+            zmin=0,
+            zmax=int(co_occurrence.max()) if co_occurrence.size else None,
             colorscale='Viridis',
             hovertemplate="<b>%{y}</b> and <b>%{x}</b><br>" +
                          "Co-occurrence: %{z}<br>" +
@@ -176,10 +402,11 @@ class SkillVisualizer:
         
         # Save to file if path provided
         if output_file:
-            fig.write_html(output_file)
+            _write_html(fig, output_file)
             
         return fig
 
+    @_cached_figure
     def generate_skill_trends(self, 
                             time_period: str = 'month',
                             top_n: int = 10,
@@ -190,51 +417,44 @@ class SkillVisualizer:
         Args:
             time_period (str): 'day', 'week', 'month', or 'year'
             top_n (int): Number of top skills to track
-            output_file (str): Optional path to save the chart as HTML
+            output_file (str): Optional path to save the chart as HTML, gzipped if it ends in .gz
             
         Returns:
             go.Figure: Plotly figure object
         """
-        # Fetch all candidates
-        candidates = self.db_client.get_all_candidates()
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(candidates)
-        
-        # Convert created_at to datetime
-        df['created_at'] = pd.to_datetime(df['created_at'])
+        # Fetch all candidates with their interned skills
+        candidates = self._get_candidates()
         
         # Get top N skills overall
-        all_skills = []
-        for skills in df['skills']:
-            if isinstance(skills, list):
-                all_skills.extend([skill.lower() for skill in skills])
-        
-        top_skills = [skill for skill, _ in Counter(all_skills).most_common(top_n)]
+        top_ids = self._top_skill_ids(candidates.counts, top_n)
+        top_skills = [candidates.vocab[i] for i in top_ids]
         
         # Create time series data
-        df['time_period'] = df['created_at'].dt.to_period(time_period[0])
+        period_starts = self._period_starts(candidates.created_at, time_period)
         
-        # Count skills over time
-        skill_trends = {}
-        for skill in top_skills:
-            skill_counts = []
-            for period in sorted(df['time_period'].unique()):
-                period_candidates = df[df['time_period'] == period]
-                count = sum(1 for skills in period_candidates['skills'] 
-                          if isinstance(skills, list) and skill in [s.lower() for s in skills])
-                skill_counts.append(count)
-            skill_trends[skill] = skill_counts
+        # Count skills over time: one row per candidate and top skill, tallied by a single
+        # crosstab; a candidate listing a skill more than once still counts once
+        keep = np.isin(candidates.skill_ids, top_ids)
+        occurrences = pd.DataFrame({
+            'candidate': candidates.rows[keep],
+            'skill': candidates.skill_ids[keep]
+        }).drop_duplicates()
+        # np.unique returns the distinct periods already sorted
+        periods = np.unique(period_starts[~np.isnat(period_starts)])
+        skill_trends = pd.crosstab(
+            period_starts[occurrences['candidate'].to_numpy()],
+            occurrences['skill'].to_numpy()
+        ).reindex(index=periods, columns=top_ids, fill_value=0)
         
         # Create figure
         fig = go.Figure()
         
         # Add line for each skill
-        for skill, counts in skill_trends.items():
+        for skill_id, skill in zip(top_ids, top_skills):
             fig.add_trace(
                 go.Scatter(
-                    x=sorted(df['time_period'].unique()),
-                    y=counts,
+                    x=periods,
+                    y=skill_trends[skill_id].tolist(),
                     name=skill,
                     mode='lines+markers',
                     hovertemplate="<b>%{x}</b><br>" +
@@ -268,6 +488,6 @@ class SkillVisualizer:
         
         # Save to file if path provided
         if output_file:
-            fig.write_html(output_file)
+            _write_html(fig, output_file)
             
         return fig 
\ No newline at end of file
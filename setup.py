@@ -14,11 +14,14 @@ setup(
         "supabase",
         "python-dotenv",
         "spacy",
-        "pyresparser",
         "nltk",
         "pdfminer.six",
+        "pypdfium2",
         "docx2txt",
-        "beautifulsoup4"
+        "beautifulsoup4",
+        "orjson",
+        "joblib",
+        "httpx"
     ],
     python_requires=">=3.8",
 ) 
\ No newline at end of file